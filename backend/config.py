@@ -2,12 +2,20 @@
 Backend configuration settings
 """
 import os
-from typing import Optional
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings"""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",  # Ignore extra fields from .env
+        frozen=True
+    )
     
     # API Configuration
     API_TITLE: str = "Titicaca Sentinel API"
@@ -15,10 +23,16 @@ class Settings(BaseSettings):
     API_VERSION: str = "1.0.0"
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
-    API_RELOAD: bool = True
+    API_RELOAD: bool = True  # Only honoured when DEBUG is enabled
+    DEBUG: bool = False
+    # Defaults to half the CPU count (min 2). Every worker serves requests from
+    # the shared on-disk cache, but only one of them runs the PREWARM_KEYS refresher
+    WORKERS: Optional[int] = None
     
     # CORS Configuration
-    CORS_ORIGINS: list = ["*"]  # In production, specify exact origins
+    # Browser origins allowed to call the API (the Streamlit dashboard calls it
+    # server-side, so only add origins for browser clients)
+    CORS_ORIGINS: List[str] = ["http://localhost:8501"]
     
     # Google Earth Engine Configuration
     GOOGLE_CLOUD_PROJECT: Optional[str] = None
@@ -30,9 +44,15 @@ class Settings(BaseSettings):
     DEFAULT_DAYS: int = 7
     DEFAULT_CLOUD_COVERAGE: int = 20
     MAX_CLOUD_COVERAGE: int = 50
+    GEE_MAX_WORKERS: int = 8  # Threads available for blocking GEE calls
     
     # Cache Settings
     CACHE_TTL: int = 600  # 10 minutes
+    # (days, cloud_coverage) payloads refreshed in the background every CACHE_TTL/2.
+    # The refresher runs in the single worker holding data/cache/refresher.lock
+    # (a flock), so GEE load does not grow with WORKERS; the other workers pick
+    # the refreshed payloads up from the cache files
+    PREWARM_KEYS: List[Tuple[int, int]] = [(7, 20), (30, 20), (180, 20)]
     
     # Legacy settings (from original .env - optional, ignored if not used)
     STREAMLIT_PORT: Optional[int] = 8501
@@ -42,12 +62,13 @@ class Settings(BaseSettings):
     ANALYSIS_MONTHS: Optional[int] = None
     UPDATE_FREQUENCY_DAYS: Optional[int] = None
     ROI_GEOJSON_PATH: Optional[str] = None
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"  # Ignore extra fields from .env
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once (parses .env) and reuse the instance"""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -3,12 +3,28 @@ TITICACA SENTINEL - FastAPI Backend (Refactored)
 Main application entry point - Scalable and maintainable architecture
 """
 
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-from typing import Optional
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import logging
 import sys
 import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, single-worker deployments only
+    fcntl = None
+
+import msgspec
+import orjson
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -16,51 +32,32 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 # Import configurations and models
 from backend.config import settings
 from backend.models import (
-    HealthResponse, LatestImageResponse, RiskMapResponse,
+    CloudCoverageQ, HealthResponse, LatestImageResponse, RiskMapResponse, DashboardResponse,
     TimeSeriesResponse, StatsResponse, ROIResponse, ComparisonResponse,
     PredictionResponse
 )
 
-# Import GEE processor
-try:
-    from gee.gee_processor import TiticacaProcessor
+# GEE processor and service (which pull in `ee`, pandas, numpy) are imported
+# lazily in the lifespan handler so importing this module stays cheap
+if TYPE_CHECKING:
     from backend.services import GEEService
-    import ee
-except ImportError as e:
-    print(f"Warning: Could not import GEE processor: {e}")
-    TiticacaProcessor = None
-    GEEService = None
-    ee = None
-
-# Initialize FastAPI app
-app = FastAPI(
-    title=settings.API_TITLE,
-    description=settings.API_DESCRIPTION,
-    version=settings.API_VERSION
-)
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
 
 # Global service instance
-gee_service: Optional[GEEService] = None
+gee_service: Optional["GEEService"] = None
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize GEE service on startup"""
-    global gee_service
+def _create_gee_service() -> Optional["GEEService"]:
+    """Import and initialize the GEE processor and service (None if unavailable)"""
+    try:
+        from gee.gee_processor import TiticacaProcessor
+        from backend.services import GEEService
+    except ImportError as e:
+        logger.warning("GEE Processor not available: %s", e)
+        return None
+
     try:
-        if not TiticacaProcessor:
-            print("⚠ GEE Processor not available")
-            return
-        
         # Initialize processor
         if (settings.EE_SERVICE_ACCOUNT_EMAIL and 
             settings.EE_PRIVATE_KEY_PATH and 
@@ -71,29 +68,254 @@ async def startup_event():
                 service_account=settings.EE_SERVICE_ACCOUNT_EMAIL,
                 key_file=settings.EE_PRIVATE_KEY_PATH
             )
-            print(f"✓ GEE Processor initialized with Service Account")
+            logger.info("GEE Processor initialized with Service Account")
         else:
             # Use default authentication
             processor = TiticacaProcessor(project_id=settings.GOOGLE_CLOUD_PROJECT)
-            print("✓ GEE Processor initialized with default credentials")
+            logger.info("GEE Processor initialized with default credentials")
         
         # Create service
-        gee_service = GEEService(processor)
-        print("✓ GEE Service ready")
+        service = GEEService(processor)
+        logger.info("GEE Service ready")
+        return service
         
     except Exception as e:
-        print(f"Error initializing GEE: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error initializing GEE: %s", e)
+        return None
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the GEE service, worker pool and refresher; tear them down on exit"""
+    global gee_service
+    # Runs once per worker; without it the backend's info logs are dropped
+    logging.basicConfig(
+        level=logging.DEBUG if settings.DEBUG else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    # Shared pool for the synchronous GEE/Prophet work done by the routes
+    app.state.pool = ThreadPoolExecutor(
+        max_workers=settings.GEE_MAX_WORKERS,
+        thread_name_prefix="gee"
+    )
+    app.state.refresher = None
+    app.state.refresher_lock = None
+
+    gee_service = _create_gee_service()
+    if gee_service is not None:
+        # The lake geometry is static per deployment: serialize it once
+        try:
+            app.state.roi_bytes = orjson.dumps(gee_service.get_roi_geojson())
+            logger.info("ROI GeoJSON precomputed")
+        except Exception as e:
+            logger.warning("Could not precompute ROI GeoJSON: %s", e)
+
+        if settings.PREWARM_KEYS:
+            app.state.refresher_lock = _acquire_refresher_lock(gee_service.cache_dir)
+            if app.state.refresher_lock is not None:
+                app.state.refresher = asyncio.create_task(_refresh_loop(gee_service))
 
-def get_service() -> GEEService:
+    try:
+        yield
+    finally:
+        if app.state.refresher is not None:
+            app.state.refresher.cancel()
+        if app.state.refresher_lock is not None:
+            app.state.refresher_lock.close()  # Releases the flock
+        app.state.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title=settings.API_TITLE,
+    description=settings.API_DESCRIPTION,
+    version=settings.API_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    # The OpenAPI schema and docs UIs are development aids: outside DEBUG they
+    # are not served, which saves building the schema in every worker
+    openapi_url="/openapi.json" if settings.DEBUG else None,
+    docs_url="/docs" if settings.DEBUG else None,
+    redoc_url="/redoc" if settings.DEBUG else None
+)
+
+
+class CORSExceptHealthMiddleware:
+    """CORSMiddleware that lets /health polls through untouched"""
+
+    def __init__(self, app, **cors_options):
+        self.app = app
+        self.cors = CORSMiddleware(app, **cors_options)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/health"):
+            await self.app(scope, receive, send)
+        else:
+            await self.cors(scope, receive, send)
+
+
+# CORS middleware (credentials are only allowed with explicit origins)
+app.add_middleware(
+    CORSExceptHealthMiddleware,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials="*" not in settings.CORS_ORIGINS,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Pending get_cached_for_period futures keyed by (days, cloud_coverage, end_offset)
+app.state.inflight = {}
+
+# Serialized ROI GeoJSON, filled at startup (or lazily on first /roi hit)
+app.state.roi_bytes = None
+ROI_CACHE_CONTROL = "public, max-age=86400"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Shared encoder for msgspec Struct payloads (TimeSeriesPoint, PredictionPoint)
+_msgspec_encoder = msgspec.json.Encoder()
+
+# Encoded bodies for /latest, /risk-map and /stats: key -> (cached_at, bytes, etag)
+_body_cache = {}
+
+# Serialized /health payload, reused for HEALTH_CACHE_SECONDS between polls
+HEALTH_CACHE_SECONDS = 30
+_health_cache = {"expires": 0.0, "body": None}
+
+
+def _acquire_refresher_lock(cache_dir):
+    """Open and flock the refresher lock file, or None if another worker holds it
+
+    The lock is held for the life of the process (closing the file releases it),
+    so exactly one uvicorn worker runs _refresh_loop.
+    """
+    lock_file = open(os.path.join(cache_dir, "refresher.lock"), "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+async def _refresh_loop(service: "GEEService"):
+    """Keep the common period payloads warm so requests are pure cache hits"""
+    # First pass only fills missing entries; later passes recompute them
+    force = False
+    while True:
+        for days, cloud_coverage in settings.PREWARM_KEYS:
+            try:
+                await get_period_payload(
+                    service, days=days, cloud_coverage=cloud_coverage, end_offset=0, force=force
+                )
+            except Exception as e:
+                logger.warning("Background refresh failed for %sd cloud%s: %s", days, cloud_coverage, e)
+        await asyncio.sleep(max(settings.CACHE_TTL // 2, 1))
+        force = True
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking service call on the worker pool without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        app.state.pool,
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+async def get_period_payload(
+    service: "GEEService",
+    days: int,
+    cloud_coverage: int,
+    end_offset: int = 0,
+    force: bool = False
+) -> Tuple[dict, bool]:
+    """Cache-aware period payload, coalescing concurrent calls for the same key
+
+    Requests arriving while the same (days, cloud_coverage, end_offset) payload
+    is being computed await that computation instead of starting another one.
+    The lookup and registration below never yield, so no lock is needed.
+
+    Returns:
+        Tuple of (payload, is_stale); stale payloads are served when GEE fails
+        but an older cache entry exists
+    """
+    key = (days, cloud_coverage, end_offset)
+    task = app.state.inflight.get(key)
+    if task is None:
+        # Detached from the request that starts it, so a client disconnect
+        # cancels only that caller's await, not the shared computation
+        task = asyncio.ensure_future(run_blocking(
+            service.get_cached_for_period_with_fallback,
+            days=days, cloud_coverage=cloud_coverage, end_offset=end_offset, force=force
+        ))
+        app.state.inflight[key] = task
+        task.add_done_callback(functools.partial(_inflight_done, key))
+    return await asyncio.shield(task)
+
+
+def _inflight_done(key: tuple, task: asyncio.Future):
+    """Unregister a finished period computation"""
+    app.state.inflight.pop(key, None)
+    if not task.cancelled():
+        # Callers re-raise it; mark it retrieved in case they all went away
+        task.exception()
+
+
+def _etag_json_response(
+    request: Request,
+    key: tuple,
+    stamp: Optional[str],
+    is_stale: bool,
+    build
+) -> Response:
+    """JSON response with an ETag, answering 304 when the client's copy is current
+
+    The encoded body and its ETag are kept per `key` and only rebuilt (via
+    `build()`) when the period cache entry they came from changes, i.e. when
+    its `cached_at` stamp differs. Stale fallbacks are flagged in the headers
+    and must not be cached by the client.
+    """
+    entry = _body_cache.get(key)
+    if entry is None or stamp is None or entry[0] != stamp:
+        body = orjson.dumps(build())
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = (stamp, body, etag)
+        _body_cache[key] = entry
+
+    _, body, etag = entry
+    if is_stale:
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "X-Cache": "STALE",
+            "Warning": '110 - "Response is stale"'
+        }
+    else:
+        headers = {"ETag": etag, "Cache-Control": f"max-age={settings.CACHE_TTL}"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak tags compare equal too (str.removeprefix needs Python 3.9)
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        candidates = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _msgspec_response(content) -> Response:
+    """Encode msgspec Structs (and plain containers of them) in one pass"""
+    return Response(content=_msgspec_encoder.encode(content), media_type="application/json")
+
+
+def get_service() -> "GEEService":
     """Dependency injection for GEE service"""
-    if not gee_service:
-        raise HTTPException(
-            status_code=503, 
-            detail="GEE service not available"
-        )
+    if gee_service is None:
+        raise HTTPException(status_code=503, detail="GEE service not available")
     return gee_service
 
 
@@ -101,29 +323,45 @@ def get_service() -> GEEService:
 # API Routes
 # ============================================================================
 
+def _cached_health_response() -> Response:
+    """Return the health payload, serializing it at most once per cache window"""
+    now = time.monotonic()
+    cache_status = "HIT"
+    if _health_cache["body"] is None or now >= _health_cache["expires"]:
+        _health_cache["body"] = orjson.dumps({
+            "status": "healthy",
+            # Rendered once per cache window, reused verbatim by the cached bytes
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "gee_available": gee_service is not None
+        })
+        _health_cache["expires"] = now + HEALTH_CACHE_SECONDS
+        cache_status = "MISS"
+
+    return Response(
+        content=_health_cache["body"],
+        media_type="application/json",
+        headers={
+            "Cache-Control": f"max-age={HEALTH_CACHE_SECONDS}",
+            "X-Cache": cache_status
+        }
+    )
+
+
 @app.get("/", response_model=HealthResponse)
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.now(),
-        gee_available=gee_service is not None
-    )
+    """Health check endpoint (cached for a few seconds to absorb polling)"""
+    return _cached_health_response()
 
 
-@app.get("/latest", response_model=LatestImageResponse)
+@app.get("/latest", response_model=None, responses={200: {"model": LatestImageResponse}})
 async def get_latest_image(
+    request: Request,
     months: Optional[int] = Query(None, description="Number of months to look back"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE, 
-        ge=10, 
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
     days: Optional[int] = Query(None, description="Number of days to look back (overrides months)"),
     force_refresh: bool = Query(False, description="Force refresh bypassing cache"),
-    service: GEEService = Depends(get_service)
+    service: "GEEService" = Depends(get_service)
 ):
     """Get the latest processed Sentinel-2 image with water quality indices"""
     try:
@@ -134,33 +372,34 @@ async def get_latest_image(
             period_days = (months or settings.DEFAULT_MONTHS) * 30
 
         # Use cached lightweight payload when available (tile urls, stats)
-        payload = service.get_cached_for_period(days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh)
+        payload, is_stale = await get_period_payload(
+            service, days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh
+        )
         date = payload.get('date')
         tile_urls = payload.get('tile_urls', {})
         stats = payload.get('statistics', {})
         
-        return LatestImageResponse(
-            date=date,
-            tile_urls=tile_urls,
-            statistics=stats
+        return _etag_json_response(
+            request, ('latest', period_days, cloud_coverage), payload.get('cached_at'), is_stale,
+            lambda: {
+                'date': date,
+                'tile_urls': tile_urls,
+                'statistics': stats
+            }
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/risk-map", response_model=RiskMapResponse)
+@app.get("/risk-map", response_model=None, responses={200: {"model": RiskMapResponse}})
 async def get_risk_map(
+    request: Request,
     months: Optional[int] = Query(None, description="Number of months to look back"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE,
-        ge=10,
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
     days: Optional[int] = Query(None, description="Number of days to look back (overrides months)"),
     force_refresh: bool = Query(False, description="Force refresh bypassing cache"),
-    service: GEEService = Depends(get_service)
+    service: "GEEService" = Depends(get_service)
 ):
     """Get environmental risk classification map"""
     try:
@@ -170,70 +409,120 @@ async def get_risk_map(
         else:
             period_days = (months or settings.DEFAULT_MONTHS) * 30
 
-        payload = service.get_cached_for_period(days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh)
+        payload, is_stale = await get_period_payload(
+            service, days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh
+        )
         date = payload.get('date')
         risk_url = payload.get('risk_url')
         risk_zones = payload.get('risk_zones', {})
         
-        return RiskMapResponse(
-            date=date,
-            tile_url=risk_url,
-            risk_zones=risk_zones
+        return _etag_json_response(
+            request, ('risk-map', period_days, cloud_coverage), payload.get('cached_at'), is_stale,
+            lambda: {
+                'date': date,
+                'tile_url': risk_url,
+                'risk_zones': risk_zones
+            }
+        )
+    
+    except Exception as e:
+        logger.exception("Risk map failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/dashboard", response_model=None, responses={200: {"model": DashboardResponse}})
+async def get_dashboard(
+    request: Request,
+    months: Optional[int] = Query(None, description="Number of months to look back"),
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
+    days: Optional[int] = Query(None, description="Number of days to look back (overrides months)"),
+    force_refresh: bool = Query(False, description="Force refresh bypassing cache"),
+    service: "GEEService" = Depends(get_service)
+):
+    """Get /latest and /risk-map for the same period in one round trip"""
+    try:
+        # Resolve period in days
+        if days:
+            period_days = days
+        else:
+            period_days = (months or settings.DEFAULT_MONTHS) * 30
+
+        payload, is_stale = await get_period_payload(
+            service, days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh
+        )
+        date = payload.get('date')
+        
+        return _etag_json_response(
+            request, ('dashboard', period_days, cloud_coverage), payload.get('cached_at'), is_stale,
+            lambda: {
+                'latest': {
+                    'date': date,
+                    'tile_urls': payload.get('tile_urls', {}),
+                    'statistics': payload.get('statistics', {})
+                },
+                'risk_map': {
+                    'date': date,
+                    'tile_url': payload.get('risk_url'),
+                    'risk_zones': payload.get('risk_zones', {})
+                }
+            }
         )
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/time-series", response_model=TimeSeriesResponse)
+@app.get("/time-series", response_model=None)
 async def get_time_series(
+    request: Request,
     lat: float = Query(..., description="Latitude", ge=-17.5, le=-15.0),
     lon: float = Query(..., description="Longitude", ge=-70.5, le=-68.0),
     months: int = Query(settings.DEFAULT_MONTHS, description="Number of months to look back"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE,
-        ge=10,
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
-    service: GEEService = Depends(get_service)
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
+    service: "GEEService" = Depends(get_service)
 ):
-    """Get time series data for a specific location within Lake Titicaca"""
+    """Get time series data for a specific location within Lake Titicaca
+
+    Clients sending `Accept: application/x-ndjson` get one JSON object per
+    line (one per data point) instead of the wrapped TimeSeriesResponse.
+    """
     try:
         # Get time series data
-        ts_data = service.get_time_series_data(
+        ts_data = await run_blocking(
+            service.get_time_series_data,
             lat=lat,
             lon=lon,
             months=months,
             cloud_coverage=cloud_coverage
         )
-        
+
         # Parse features
         data_points = service.parse_time_series(ts_data)
-        
-        return TimeSeriesResponse(
+
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            async def _gen():
+                for row in data_points:
+                    yield _msgspec_encoder.encode(row) + b"\n"
+
+            return StreamingResponse(_gen(), media_type=NDJSON_MEDIA_TYPE)
+
+        return _msgspec_response(TimeSeriesResponse(
             location={'lat': lat, 'lon': lon},
             data=data_points
-        )
+        ))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/stats", response_model=StatsResponse)
+@app.get("/stats", response_model=None, responses={200: {"model": StatsResponse}})
 async def get_statistics(
+    request: Request,
     months: Optional[int] = Query(None, description="Number of months to look back"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE,
-        ge=10,
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
     days: Optional[int] = Query(None, description="Number of days to look back"),
     force_refresh: bool = Query(False, description="Force refresh bypassing cache"),
-    service: GEEService = Depends(get_service)
+    service: "GEEService" = Depends(get_service)
 ):
     """Get comprehensive lake statistics"""
     try:
@@ -243,24 +532,34 @@ async def get_statistics(
         else:
             period_days = (months or settings.DEFAULT_MONTHS) * 30
 
-        payload = service.get_cached_for_period(days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh)
+        payload, is_stale = await get_period_payload(
+            service, days=period_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh
+        )
         date = payload.get('date')
         stats = payload.get('statistics', {})
 
-        # Organize statistics
-        organized_stats = service.organize_statistics(stats, date)
-        
-        return StatsResponse(**organized_stats)
+        # Organize statistics (only when the cached body is out of date)
+        return _etag_json_response(
+            request, ('stats', period_days, cloud_coverage), payload.get('cached_at'), is_stale,
+            lambda: service.organize_statistics(stats, date)
+        )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/roi", response_model=ROIResponse)
-async def get_roi(service: GEEService = Depends(get_service)):
+@app.get("/roi", response_model=None, responses={200: {"model": ROIResponse}})
+async def get_roi(service: "GEEService" = Depends(get_service)):
     """Get Lake Titicaca ROI geometry as GeoJSON"""
     try:
-        return service.get_roi_geojson()
+        if app.state.roi_bytes is None:
+            app.state.roi_bytes = orjson.dumps(await run_blocking(service.get_roi_geojson))
+
+        return Response(
+            content=app.state.roi_bytes,
+            media_type="application/json",
+            headers={"Cache-Control": ROI_CACHE_CONTROL}
+        )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -271,46 +570,38 @@ async def compare_periods(
     period1_days: int = Query(7, description="Days for recent period"),
     period2_days: int = Query(7, description="Days for comparison period"),
     period2_offset: int = Query(30, description="Days to offset period 2 from present"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE,
-        ge=10,
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
     force_refresh: bool = Query(False, description="Force refresh both periods and bypass cache"),
-    service: GEEService = Depends(get_service)
+    service: "GEEService" = Depends(get_service)
 ):
     """Compare two temporal periods to detect changes
     
     Example: Compare last 7 days vs 7 days from 30 days ago
     """
     try:
-        comparison = service.compare_periods(
-            period1_days=period1_days,
-            period2_days=period2_days,
-            period2_offset_days=period2_offset,
-            force=force_refresh,
-            cloud_coverage=cloud_coverage
+        # Both periods are independent cache entries: fetch them concurrently
+        (p1, _), (p2, _) = await asyncio.gather(
+            get_period_payload(
+                service, days=period1_days, cloud_coverage=cloud_coverage, end_offset=0, force=force_refresh
+            ),
+            get_period_payload(
+                service, days=period2_days, cloud_coverage=cloud_coverage, end_offset=period2_offset, force=force_refresh
+            )
         )
-        
-        return comparison
+
+        return service.build_comparison(p1, p2)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/predict", response_model=PredictionResponse, tags=["Prediction"])
+@app.get("/predict", response_model=None, responses={200: {"model": PredictionResponse}}, tags=["Prediction"])
 async def predict_time_series(
     metric: str = Query("ndci", description="Metric to predict: ndci, ndwi, turbidity, or chla_approx"),
     historical_days: int = Query(90, ge=30, le=180, description="Days of historical data to use"),
     forecast_days: int = Query(7, ge=1, le=14, description="Days to forecast into future"),
-    cloud_coverage: int = Query(
-        settings.DEFAULT_CLOUD_COVERAGE,
-        ge=10,
-        le=settings.MAX_CLOUD_COVERAGE,
-        description="Maximum cloud coverage percentage"
-    ),
-    service: GEEService = Depends(get_service)
+    cloud_coverage: CloudCoverageQ = settings.DEFAULT_CLOUD_COVERAGE,
+    service: "GEEService" = Depends(get_service)
 ):
     """Predict future values using Prophet time series forecasting
     
@@ -337,32 +628,31 @@ async def predict_time_series(
                 detail=f"Invalid metric '{metric}'. Must be one of: {', '.join(valid_metrics)}"
             )
         
-        print(f"[PREDICT] Starting prediction for {metric}, {historical_days} days, forecast {forecast_days}")
+        logger.info("[PREDICT] Starting prediction for %s, %s days, forecast %s", metric, historical_days, forecast_days)
         
-        prediction = service.predict_time_series(
+        prediction = await run_blocking(
+            service.predict_time_series,
             metric=metric,
             historical_days=historical_days,
             forecast_days=forecast_days,
             cloud_coverage=cloud_coverage
         )
         
-        print(f"[PREDICT] Prediction completed successfully")
+        logger.info("[PREDICT] Prediction completed successfully")
         
-        return prediction
+        return _msgspec_response(prediction)
     
     except ValueError as e:
-        print(f"[PREDICT ERROR] ValueError: {str(e)}")
+        logger.warning("[PREDICT ERROR] ValueError: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except ImportError as e:
-        print(f"[PREDICT ERROR] ImportError: {str(e)}")
+        logger.error("[PREDICT ERROR] ImportError: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Prophet library not installed. Run: pip install prophet"
         )
     except Exception as e:
-        print(f"[PREDICT ERROR] Exception: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[PREDICT ERROR] Exception: %s: %s", type(e).__name__, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -373,10 +663,21 @@ async def predict_time_series(
 if __name__ == "__main__":
     import uvicorn
     
+    if settings.DEBUG and settings.API_RELOAD:
+        # Development: single auto-reloading process
+        run_options = {"reload": True}
+    else:
+        # Production: uvloop + httptools and several worker processes
+        run_options = {
+            "loop": "uvloop",
+            "http": "httptools",
+            "workers": settings.WORKERS or max(2, (os.cpu_count() or 2) // 2)
+        }
+
     uvicorn.run(
         "main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
-        reload=settings.API_RELOAD,
-        timeout_keep_alive=300  # 5 minutos para procesamiento largo de GEE
+        timeout_keep_alive=300,  # 5 minutos para procesamiento largo de GEE
+        **run_options
     )
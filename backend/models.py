@@ -1,10 +1,41 @@
 """
 Pydantic models for API requests and responses
+
+Hot, validator-free payload types (time series and prediction points) are
+msgspec Structs so they can be encoded without a Pydantic round trip.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+import msgspec
+from fastapi import Query
+from pydantic import BaseModel
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 
+from backend.config import settings
+
+__all__ = [
+    'CloudCoverageQ',
+    'HealthResponse',
+    'LatestImageResponse',
+    'RiskMapResponse',
+    'DashboardResponse',
+    'TimeSeriesPoint',
+    'TimeSeriesResponse',
+    'StatsResponse',
+    'ComparisonResponse',
+    'PredictionPoint',
+    'PredictionResponse',
+    'ROIFeature',
+    'ROIResponse',
+]
+
+
+# Shared query parameter: one validator definition reused by every endpoint
+CloudCoverageQ = Annotated[int, Query(
+    ge=10,
+    le=settings.MAX_CLOUD_COVERAGE,
+    description="Maximum cloud coverage percentage"
+)]
+
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -27,7 +58,13 @@ class RiskMapResponse(BaseModel):
     risk_zones: Dict[str, int]
 
 
-class TimeSeriesPoint(BaseModel):
+class DashboardResponse(BaseModel):
+    """Latest image and risk map for one period, fetched in a single request"""
+    latest: LatestImageResponse
+    risk_map: RiskMapResponse
+
+
+class TimeSeriesPoint(msgspec.Struct):
     """Single time series data point"""
     date: str
     ndwi: Optional[float] = None
@@ -37,7 +74,7 @@ class TimeSeriesPoint(BaseModel):
     chla_approx: Optional[float] = None
 
 
-class TimeSeriesResponse(BaseModel):
+class TimeSeriesResponse(msgspec.Struct):
     """Time series response"""
     location: Dict[str, float]
     data: List[TimeSeriesPoint]
@@ -59,22 +96,22 @@ class ComparisonResponse(BaseModel):
     alerts: List[Dict[str, str]]  # Significant changes detected
 
 
-class PredictionPoint(BaseModel):
+class PredictionPoint(msgspec.Struct):
     """Single prediction point"""
     date: str
     predicted_value: float
     lower_bound: float
     upper_bound: float
-    confidence: float = Field(..., ge=0, le=1, description="Prediction confidence (0-1)")
+    confidence: Annotated[float, msgspec.Meta(ge=0, le=1, description="Prediction confidence (0-1)")]
 
 
 class PredictionResponse(BaseModel):
     """Time series prediction response"""
     metric: str  # ndci, ndwi, turbidity, chla_approx
     historical_data: List[Dict[str, Any]]  # Historical time series
-    predictions: List[Dict[str, Any]]  # Future predictions (changed from List[PredictionPoint])
+    predictions: List[Dict[str, Any]]  # Future predictions (PredictionPoint structs)
     forecast_days: int
-    model_metrics: Dict[str, float]  # MAE, RMSE, etc
+    model_metrics: Dict[str, Any]  # MAE, RMSE, MAPE, data_points, validation method
     alerts: List[Dict[str, str]]  # Alerts if predicted values exceed thresholds
     generated_at: str
 
@@ -1,19 +1,152 @@
 """
 Service layer for GEE operations
 """
-from typing import Dict, Tuple, Optional, List
-import ee
-import json
+import functools
+import hashlib
+import logging
 import os
+import tempfile
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from backend.models import TimeSeriesPoint
-import pandas as pd
+from typing import Dict, Tuple, Optional, List
+
+import ee
 import numpy as np
+import orjson
+import pandas as pd
+
+from backend.models import PredictionPoint, TimeSeriesPoint
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when processing changes so cached payloads from older algorithms are ignored
+PROCESSOR_VERSION = 1
+# Cache keys carry the processor version and ROI hash, which covers algorithm and
+# ROI changes but not freshness: "latest" payloads (end_offset 0) pick up new
+# scenes and carry expiring GEE tile URLs, so only historical periods live long
+CACHE_TTL_DAYS = 5
+HISTORICAL_CACHE_TTL_DAYS = 30
+
+
+def _period_ttl_days(end_offset: int) -> int:
+    """Cache TTL for a period payload ending `end_offset` days ago"""
+    return CACHE_TTL_DAYS if end_offset == 0 else HISTORICAL_CACHE_TTL_DAYS
+
+# Prophet trend simulations used for yhat_lower/yhat_upper (library default: 1000)
+_UNCERTAINTY_SAMPLES = 200
+
+# Prediction metric -> statistics key (stats keys are uppercase band names)
+_METRIC_MAPPING = {
+    'ndci': 'NDCI_mean',
+    'ndwi': 'NDWI_mean',
+    'turbidity': 'Turbidity_mean',
+    'chla_approx': 'Chla_approx_mean'
+}
+
+# Alert thresholds per prediction metric
+_THRESHOLDS = {
+    'ndci': {'high': 0.2, 'critical': 0.3},
+    'ndwi': {'low': 0, 'critical_low': -0.2},
+    'turbidity': {'high': 1.5, 'critical': 2.0},
+    'chla_approx': {'high': 30, 'critical': 50}
+}
+
+# Index bands reported by the processor's statistics
+BANDS = ('NDWI', 'NDCI', 'CI_green', 'Turbidity', 'TSM', 'Chla_approx')
+_MEAN_KEYS = tuple(f'{band}_mean' for band in BANDS)
+_PCTL_NAMES = ('p10', 'p50', 'p90')
+_PCTL_KEYS = {band: tuple(f'{band}_{p}' for p in _PCTL_NAMES) for band in BANDS}
+
+
+def _round_stats(stats: Dict, ndigits: int = 6) -> Dict:
+    """Round float statistics so cache files don't carry spurious precision"""
+    return {k: round(v, ndigits) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def _build_alerts(dates: List[str], values: np.ndarray, rules: List[Tuple]) -> List[Dict]:
+    """Emit at most one alert per predicted date, using the first matching rule
+
+    Args:
+        dates: Formatted prediction dates
+        values: Predicted values aligned with `dates`
+        rules: (mask, severity, message_template, recommendation) tuples, most
+            severe first; templates are formatted with `value`
+    """
+    rule_idx = np.full(len(values), -1)
+    for i, (mask, *_rest) in enumerate(rules):
+        rule_idx[mask & (rule_idx < 0)] = i
+
+    alerts = []
+    for row in np.flatnonzero(rule_idx >= 0):
+        _, severity, template, recommendation = rules[rule_idx[row]]
+        alerts.append({
+            'date': dates[row],
+            'severity': severity,
+            'message': template.format(value=float(values[row])),
+            'recommendation': recommendation
+        })
+    return alerts
+
+
+def _ndci_alerts(dates, values, threshold):
+    return _build_alerts(dates, values, [
+        (values > threshold['critical'], 'critical',
+         'ALERTA CRÍTICA: NDCI predicho {value:.3f} indica florecimiento algal severo',
+         'Activar protocolo de emergencia. Muestreo in-situ inmediato.'),
+        (values > threshold['high'], 'high',
+         'ALERTA: NDCI predicho {value:.3f} indica alto riesgo de eutrofización',
+         'Incrementar monitoreo. Preparar equipos de muestreo.'),
+    ])
+
+
+def _turbidity_alerts(dates, values, threshold):
+    return _build_alerts(dates, values, [
+        (values > threshold['critical'], 'critical',
+         'ALERTA CRÍTICA: Turbidez predicha {value:.3f} extremadamente alta',
+         'Investigar fuentes de sedimentación. Revisar erosión.'),
+        (values > threshold['high'], 'high',
+         'ALERTA: Turbidez predicha {value:.3f} elevada',
+         'Monitorear fuentes de sedimentos.'),
+    ])
+
+
+def _ndwi_alerts(dates, values, threshold):
+    return _build_alerts(dates, values, [
+        (values < threshold['critical_low'], 'high',
+         'ALERTA: NDWI predicho {value:.3f} muy bajo',
+         'Verificar niveles de agua. Posible sequía.'),
+    ])
+
+
+def _chla_alerts(dates, values, threshold):
+    return _build_alerts(dates, values, [
+        (values > threshold['critical'], 'critical',
+         'ALERTA CRÍTICA: Clorofila-a predicha {value:.1f} µg/L crítica',
+         'Florecimiento algal severo esperado. Alertar autoridades.'),
+        (values > threshold['high'], 'high',
+         'ALERTA: Clorofila-a predicha {value:.1f} µg/L elevada',
+         'Riesgo moderado de bloom algal.'),
+    ])
+
+
+# Per-metric alert rules for predicted values
+_ALERT_HANDLERS = {
+    'ndci': _ndci_alerts,
+    'turbidity': _turbidity_alerts,
+    'ndwi': _ndwi_alerts,
+    'chla_approx': _chla_alerts,
+}
 
 
 class GEEService:
     """Service for Google Earth Engine operations"""
+
+    # Lake geometry never changes: shared across instances, persisted to disk
+    _ROI_CACHE: Optional[Dict] = None
+    _ROI_LOCK = threading.Lock()
+    ROI_CACHE_TTL_DAYS = 30
     
     def __init__(self, processor):
         """Initialize with GEE processor instance"""
@@ -21,6 +154,12 @@ class GEEService:
         # Cache directory for storing lightweight results (tile URLs, stats)
         self.cache_dir = Path('./data/cache')
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # One lock per cache file so concurrent writers don't clobber each other
+        self._cache_locks: Dict[Path, threading.Lock] = {}
+        self._cache_locks_guard = threading.Lock()
+        # Parsed period cache files keyed by (path, st_mtime_ns): a file replaced
+        # by any worker has a new mtime, so it is re-read instead of served stale
+        self._period_cache_reader = functools.lru_cache(maxsize=128)(self._read_period_file)
     
     def get_latest_image_data(
         self, 
@@ -87,18 +226,21 @@ class GEEService:
         """
         try:
             risk_image = composite.select('Risk_Level')
+            # tileScale shards the reduction so it completes at the requested
+            # scale instead of being downsampled by bestEffort
             risk_stats_raw = risk_image.reduceRegion(
                 reducer=ee.Reducer.frequencyHistogram(),
                 geometry=roi,
                 scale=100,
-                maxPixels=1e9,
-                bestEffort=True
+                maxPixels=1e10,
+                tileScale=4
             ).getInfo()
             
-            risk_zones = risk_stats_raw.get('Risk_Level', {})
-            return {str(k): int(v) for k, v in risk_zones.items()}
+            risk_zones = risk_stats_raw.get('Risk_Level') or {}
+            # Always report every level, even when a level has no pixels
+            return {level: int(risk_zones.get(level, 0)) for level in ('1', '2', '3')}
         except Exception as e:
-            print(f"Warning: Could not calculate risk zones: {e}")
+            logger.warning("Could not calculate risk zones: %s", e)
             return {'1': 0, '2': 0, '3': 0}
     
     def get_time_series_data(
@@ -116,8 +258,8 @@ class GEEService:
             cloud_coverage=cloud_coverage
         )
     
-    def parse_time_series(self, ts_data: Dict) -> list:
-        """Parse time series features into TimeSeriesPoint objects"""
+    def parse_time_series(self, ts_data: Dict) -> List[TimeSeriesPoint]:
+        """Parse time series features into TimeSeriesPoint structs"""
         data_points = []
         for feature in ts_data.get('features', []):
             props = feature.get('properties', {})
@@ -134,25 +276,96 @@ class GEEService:
         return data_points
 
     # --------------------- CACHING HELPERS ---------------------
+    @functools.cached_property
+    def _roi_hash(self) -> str:
+        """Short digest of the ROI geometry, computed once per process
+
+        Prefers the on-disk ROI regardless of its TTL (the lake outline never
+        changes), so cache paths still resolve when GEE is unreachable.
+        """
+        roi = GEEService._ROI_CACHE
+        if roi is None:
+            try:
+                roi = self._read_cache_file(self.cache_dir / 'roi_geojson.json')['geojson']
+            except Exception:
+                roi = self.get_roi_geojson()
+        geometry = roi['features'][0]['geometry']
+        return hashlib.sha1(orjson.dumps(geometry, option=orjson.OPT_SORT_KEYS)).hexdigest()[:8]
+
     def _cache_filename(self, days: int, cloud_coverage: int, end_offset: int) -> str:
-        return f"latest_{days}d_cloud{cloud_coverage}_offset{end_offset}.json"
+        return f"latest_v{PROCESSOR_VERSION}_{self._roi_hash}_{days}d_cloud{cloud_coverage}_offset{end_offset}.json"
 
     def _cache_path(self, days: int, cloud_coverage: int, end_offset: int) -> Path:
         return self.cache_dir / self._cache_filename(days, cloud_coverage, end_offset)
 
-    def _is_cache_valid(self, path: Path, ttl_days: int = 5) -> bool:
-        if not path.exists():
-            return False
+    def _means_cache_path(self, days: int, cloud_coverage: int, end_offset: int) -> Path:
+        """Cache file for period means computed in batch (no tiles / risk data)"""
+        return self.cache_dir / f"means_v{PROCESSOR_VERSION}_{self._roi_hash}_{days}d_cloud{cloud_coverage}_offset{end_offset}.json"
+
+    def _cache_lock(self, path: Path) -> threading.Lock:
+        with self._cache_locks_guard:
+            return self._cache_locks.setdefault(path, threading.Lock())
+
+    def _write_cache(self, path: Path, payload: Dict):
+        """Atomically replace `path` so readers never see a partially written file"""
+        tmp_path = None
         try:
-            with open(path, 'r') as f:
-                payload = json.load(f)
-            cached_at = payload.get('cached_at')
-            if not cached_at:
-                return False
-            cached_time = datetime.fromisoformat(cached_at)
-            return (datetime.utcnow() - cached_time) <= timedelta(days=ttl_days)
-        except Exception:
+            with self._cache_lock(path):
+                # Unique temp file in the same directory (also safe across workers)
+                fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(orjson.dumps(payload))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Could not write cache to %s: %s", path, e)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _read_cache_file(self, path: Path) -> Dict:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _is_fresh(self, payload: Dict, ttl_days: int = CACHE_TTL_DAYS) -> bool:
+        cached_at = payload.get('cached_at')
+        if not cached_at:
             return False
+        cached_time = datetime.fromisoformat(cached_at)
+        return (datetime.utcnow() - cached_time) <= timedelta(days=ttl_days)
+
+    def _read_period_file(self, path: Path, mtime_ns: int) -> Dict:
+        """Parse a period cache file; `mtime_ns` only keys the memo on the file version"""
+        return self._read_cache_file(path)
+
+    def _load_period_cache(self, days: int, cloud_coverage: int, end_offset: int) -> Optional[Dict]:
+        """Fresh cached payload for a period, served from memory after the first read"""
+        try:
+            path = self._cache_path(days, cloud_coverage, end_offset)
+            payload = self._period_cache_reader(path, os.stat(path).st_mtime_ns)
+            fresh = self._is_fresh(payload, _period_ttl_days(end_offset))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Failed to load cache for period=%sd offset=%s: %s", days, end_offset, e)
+            return None
+        return payload if fresh else None
+
+    def _load_valid_cache(self, path: Path, ttl_days: int = CACHE_TTL_DAYS) -> Optional[Dict]:
+        """Cached payload at `path`, or None when missing, expired or unreadable"""
+        try:
+            if os.path.getsize(path) == 0:
+                return None
+        except OSError:
+            # Missing file
+            return None
+        try:
+            payload = self._read_cache_file(path)
+            fresh = self._is_fresh(payload, ttl_days)
+        except Exception as e:
+            logger.warning("Failed to load cache %s: %s", path, e)
+            return None
+        return payload if fresh else None
 
     def get_cached_for_period(self, days: int, cloud_coverage: int = 20, end_offset: int = 0, force: bool = False) -> Dict:
         """Return cached statistics and tile URLs for the specified period.
@@ -162,16 +375,13 @@ class GEEService:
         """
         cache_path = self._cache_path(days, cloud_coverage, end_offset)
 
-        if not force and self._is_cache_valid(cache_path):
-            try:
-                with open(cache_path, 'r') as f:
-                    data = json.load(f)
+        if not force:
+            data = self._load_period_cache(days, cloud_coverage, end_offset)
+            if data is not None:
                 return data
-            except Exception as e:
-                print(f"Warning: Failed to load cache {cache_path}: {e}")
 
         # Cache miss or forced refresh -> run heavy processing once
-        print(f"Cache miss or refresh requested for period={days}d offset={end_offset} - running GEE processing...")
+        logger.info("Cache miss or refresh requested for period=%sd offset=%s - running GEE processing...", days, end_offset)
         composite, roi, date = self.processor.process_latest(days=days, cloud_coverage=cloud_coverage, end_date_offset=end_offset)
 
         # Compute lightweight results
@@ -182,7 +392,7 @@ class GEEService:
 
         payload = {
             'date': date,
-            'statistics': stats,
+            'statistics': _round_stats(stats),
             'tile_urls': tiles,
             'risk_url': risk_url,
             'risk_zones': risk_zones,
@@ -194,16 +404,61 @@ class GEEService:
             'cached_at': datetime.utcnow().isoformat()
         }
 
+        self._write_cache(cache_path, payload)
+
+        return payload
+    
+    def get_cached_for_period_with_fallback(
+        self,
+        days: int,
+        cloud_coverage: int = 20,
+        end_offset: int = 0,
+        force: bool = False
+    ) -> Tuple[Dict, bool]:
+        """Like get_cached_for_period, but serve the last cached payload if GEE fails
+
+        Returns:
+            Tuple of (payload, is_stale); is_stale is True when processing failed
+            and an expired (or force-bypassed) cache entry was returned instead
+        """
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(payload, f, indent=2)
+            return self.get_cached_for_period(days, cloud_coverage, end_offset, force), False
         except Exception as e:
-            print(f"Warning: Could not write cache to {cache_path}: {e}")
+            error = e
 
-        return payload
+        try:
+            cache_path = self._cache_path(days, cloud_coverage, end_offset)
+            payload = self._read_cache_file(cache_path)
+        except Exception:
+            # Nothing usable on disk: surface the original processing error
+            raise error
+
+        logger.warning("GEE processing failed (%s); serving stale cache %s", error, cache_path)
+        return payload, True
     
     def get_roi_geojson(self) -> Dict:
-        """Get Lake Titicaca ROI as GeoJSON"""
+        """Get Lake Titicaca ROI as GeoJSON (memory, then disk, then GEE)"""
+        if GEEService._ROI_CACHE is not None:
+            return GEEService._ROI_CACHE
+
+        with GEEService._ROI_LOCK:
+            if GEEService._ROI_CACHE is None:
+                cache_path = self.cache_dir / 'roi_geojson.json'
+                cached = self._load_valid_cache(cache_path, ttl_days=self.ROI_CACHE_TTL_DAYS)
+                if cached is not None:
+                    GEEService._ROI_CACHE = cached['geojson']
+                else:
+                    geojson = self._compute_roi_geojson()
+                    self._write_cache(cache_path, {
+                        'geojson': geojson,
+                        'cached_at': datetime.utcnow().isoformat()
+                    })
+                    GEEService._ROI_CACHE = geojson
+
+        return GEEService._ROI_CACHE
+
+    def _compute_roi_geojson(self) -> Dict:
+        """Fetch the ROI geometry and area from GEE"""
         roi = self.processor.get_lake_roi()
         geojson = roi.getInfo()
         area_km2 = roi.area(maxError=10).getInfo() / 1e6
@@ -226,17 +481,12 @@ class GEEService:
         Returns:
             Dictionary with means and percentiles organized by band
         """
-        means = {k: v for k, v in stats.items() if '_mean' in k}
-        
-        percentiles = {}
-        bands = ['NDWI', 'NDCI', 'CI_green', 'Turbidity', 'TSM', 'Chla_approx']
+        means = {k: stats[k] for k in _MEAN_KEYS if k in stats}
         
-        for band in bands:
-            percentiles[band] = {
-                'p10': stats.get(f'{band}_p10', 0),
-                'p50': stats.get(f'{band}_p50', 0),
-                'p90': stats.get(f'{band}_p90', 0)
-            }
+        percentiles = {
+            band: dict(zip(_PCTL_NAMES, (stats.get(k, 0) for k in keys)))
+            for band, keys in _PCTL_KEYS.items()
+        }
         
         return {
             'date': date,
@@ -244,29 +494,15 @@ class GEEService:
             'percentiles': percentiles
         }
     
-    def compare_periods(
-        self,
-        period1_days: int,
-        period2_days: int,
-        period2_offset_days: int,
-        force: bool = False,
-        cloud_coverage: int = 20
-    ) -> Dict:
-        """Compare two temporal periods
-        
-        Args:
-            period1_days: Days for recent period
-            period2_days: Days for comparison period
-            period2_offset_days: Days to offset period2 from present
-            cloud_coverage: Max cloud coverage
-            
+    def build_comparison(self, p1: Dict, p2: Dict) -> Dict:
+        """Diff two cached period payloads (see get_cached_for_period)
+
+        Pure computation with no GEE access; the /compare route fetches both
+        payloads concurrently and diffs them here.
+
         Returns:
             Dictionary with comparison data
         """
-        # Get data for both periods (use cache to avoid repeated heavy GEE calls)
-        p1 = self.get_cached_for_period(days=period1_days, cloud_coverage=cloud_coverage, end_offset=0, force=force)
-        p2 = self.get_cached_for_period(days=period2_days, cloud_coverage=cloud_coverage, end_offset=period2_offset_days, force=force)
-
         date1 = p1.get('date')
         stats1 = p1.get('statistics', {})
         tiles1 = p1.get('tile_urls', {})
@@ -276,35 +512,36 @@ class GEEService:
         tiles2 = p2.get('tile_urls', {})
         
         # Calculate changes and detect anomalies
-        changes = {}
-        percent_changes = {}
         alerts = []
         
         # Key indices to monitor
         key_indices = ['NDCI_mean', 'NDWI_mean', 'Turbidity_mean', 'Chla_approx_mean']
         
-        for key in key_indices:
-            if key in stats1 and key in stats2:
-                val1 = stats1[key]
-                val2 = stats2[key]
-                change = val1 - val2
-                changes[key] = change
-                
-                # Calculate percent change (avoid division by zero)
-                if abs(val2) > 0.001:
-                    pct_change = (change / val2) * 100
-                    percent_changes[key] = pct_change
-                    
-                    # Alert if change > 20%
-                    if abs(pct_change) > 20:
-                        index_name = key.replace('_mean', '').replace('_', ' ').title()
-                        direction = "aumento" if pct_change > 0 else "disminución"
-                        alerts.append({
-                            'index': index_name,
-                            'change': f"{pct_change:+.1f}%",
-                            'message': f"{index_name}: {direction} significativo de {abs(pct_change):.1f}%",
-                            'severity': 'high' if abs(pct_change) > 50 else 'medium'
-                        })
+        # Diff all indices at once; missing values become NaN and drop out
+        v1 = np.array([stats1.get(k, np.nan) for k in key_indices], dtype=np.float64)
+        v2 = np.array([stats2.get(k, np.nan) for k in key_indices], dtype=np.float64)
+        change = v1 - v2
+        # Percent change only where the baseline is away from zero
+        valid_base = np.abs(v2) > 0.001
+        pct = np.full_like(change, np.nan)
+        np.divide(change * 100, v2, out=pct, where=valid_base)
+        
+        has_change = ~np.isnan(change)
+        has_pct = ~np.isnan(pct)
+        changes = {k: float(c) for k, c, ok in zip(key_indices, change, has_change) if ok}
+        percent_changes = {k: float(p) for k, p, ok in zip(key_indices, pct, has_pct) if ok}
+        
+        # Alert if change > 20%
+        for i in np.flatnonzero(has_pct & (np.abs(pct) > 20)):
+            pct_change = float(pct[i])
+            index_name = key_indices[i].replace('_mean', '').replace('_', ' ').title()
+            direction = "aumento" if pct_change > 0 else "disminución"
+            alerts.append({
+                'index': index_name,
+                'change': f"{pct_change:+.1f}%",
+                'message': f"{index_name}: {direction} significativo de {abs(pct_change):.1f}%",
+                'severity': 'high' if abs(pct_change) > 50 else 'medium'
+            })
         
         return {
             'period1': {
@@ -345,6 +582,12 @@ class GEEService:
         except ImportError:
             raise ImportError("Prophet not installed. Run: pip install prophet")
         
+        # Fail fast on unknown metrics, before any GEE work
+        metric = metric.lower()
+        metric_key = _METRIC_MAPPING.get(metric)
+        if metric_key is None:
+            raise ValueError(f"Unknown metric: {metric}")
+        
         # Get historical data
         historical_data = []
         errors = []
@@ -353,58 +596,62 @@ class GEEService:
         # Sample every 14 days to reduce GEE calls while maintaining trend
         sample_interval = 14 if historical_days >= 60 else 7
         
-        print(f"[PREDICT] Collecting historical data with interval {sample_interval} days")
-        
-        for offset in range(0, historical_days, sample_interval):
+        logger.info("[PREDICT] Collecting historical data with interval %s days", sample_interval)
+        
+        # Reuse cached period payloads (full or means-only) where available
+        offsets = list(range(0, historical_days, sample_interval))
+        period_data = {}
+        missing = []
+        for offset in offsets:
+            data = (self._load_period_cache(7, cloud_coverage, offset)
+                    or self._load_valid_cache(self._means_cache_path(7, cloud_coverage, offset),
+                                              ttl_days=_period_ttl_days(offset)))
+            if data is not None:
+                period_data[offset] = data
+            else:
+                missing.append(offset)
+
+        # Reduce every missing period server-side in a single Earth Engine request
+        if missing:
+            logger.info("[PREDICT] Fetching %d uncached periods in one batch...", len(missing))
             try:
-                print(f"[PREDICT] Fetching data for offset {offset} days...")
-                data = self.get_cached_for_period(
-                    days=7,
-                    cloud_coverage=cloud_coverage,
-                    end_offset=offset,
-                    force=False
+                batch = self.processor.get_time_series_means(
+                    missing, days=7, cloud_coverage=cloud_coverage
                 )
-                
-                stats = data.get('statistics', {})
-                date_str = data.get('date', '')
-                
-                print(f"[PREDICT] Got data for date {date_str}, stats keys: {list(stats.keys())}")
-                
-                # Extract mean value for the metric
-                # Stats keys are in UPPERCASE, but metric param is lowercase
-                # Map lowercase metric to uppercase stat key
-                metric_mapping = {
-                    'ndci': 'NDCI_mean',
-                    'ndwi': 'NDWI_mean',
-                    'turbidity': 'Turbidity_mean',
-                    'chla_approx': 'Chla_approx_mean'
-                }
-                
-                metric_key = metric_mapping.get(metric.lower())
-                
-                if not metric_key:
-                    print(f"[PREDICT] Unknown metric: {metric}")
-                    continue
-                
-                print(f"[PREDICT] Looking for metric key: {metric_key}")
-                
-                if metric_key in stats:
-                    value = stats[metric_key]
-                    print(f"[PREDICT] Found value {value} for {metric_key} at {date_str}")
-                    historical_data.append({
-                        'ds': date_str,  # Prophet expects 'ds' column
-                        'y': value  # Prophet expects 'y' column
-                    })
-                else:
-                    print(f"[PREDICT] Metric key {metric_key} not found in stats")
             except Exception as e:
-                print(f"[PREDICT] Error at offset {offset}: {str(e)}")
-                errors.append(f"Error at offset {offset}: {str(e)}")
+                logger.warning("[PREDICT] Error fetching periods %s: %s", missing, e)
+                errors.append(f"Error fetching periods {missing}: {str(e)}")
+                batch = {}
+
+            for offset, data in batch.items():
+                data['statistics'] = _round_stats(data.get('statistics', {}))
+                data['params'] = {'days': 7, 'cloud_coverage': cloud_coverage, 'end_offset': offset}
+                data['cached_at'] = datetime.utcnow().isoformat()
+                self._write_cache(self._means_cache_path(7, cloud_coverage, offset), data)
+                period_data[offset] = data
+
+        for offset in offsets:
+            data = period_data.get(offset)
+            if data is None:
+                logger.debug("[PREDICT] No images for offset %s days", offset)
                 continue
+            
+            stats = data.get('statistics', {})
+            date_str = data.get('date', '')
+            
+            if metric_key in stats:
+                value = stats[metric_key]
+                logger.debug("[PREDICT] Found value %s for %s at %s", value, metric_key, date_str)
+                historical_data.append({
+                    'ds': date_str,  # Prophet expects 'ds' column
+                    'y': value  # Prophet expects 'y' column
+                })
+            else:
+                logger.debug("[PREDICT] Metric key %s not found in stats", metric_key)
         
-        print(f"[PREDICT] Collected {len(historical_data)} historical data points")
+        logger.info("[PREDICT] Collected %d historical data points", len(historical_data))
         if errors:
-            print(f"[PREDICT] Errors encountered: {errors}")
+            logger.warning("[PREDICT] Errors encountered: %s", errors)
         if len(historical_data) < 3:
             raise ValueError(f"Insufficient historical data: {len(historical_data)} points. Need at least 3.")
         
@@ -419,162 +666,85 @@ class GEEService:
             weekly_seasonality=True,
             yearly_seasonality=False,
             interval_width=0.95,  # 95% confidence interval
-            changepoint_prior_scale=0.05  # Less flexible to avoid overfitting
+            changepoint_prior_scale=0.05,  # Less flexible to avoid overfitting
+            uncertainty_samples=_UNCERTAINTY_SAMPLES  # Approximate bounds, much faster predict
         )
         
         model.fit(df)
         
-        # Create future dataframe
-        future = model.make_future_dataframe(periods=forecast_days, freq='D')
+        # Create future dataframe (future rows only)
+        last_ds = df['ds'].max()
+        future = model.make_future_dataframe(periods=forecast_days, freq='D', include_history=False)
+        future_only = future[future['ds'] > last_ds]
         
-        # Make predictions
-        forecast = model.predict(future)
+        # One predict call covering the validation tail (last 20% of the
+        # history) plus the forecast horizon, instead of the whole history
+        tail_size = max(1, len(df) - int(len(df) * 0.8))
+        tail_df = df.iloc[-tail_size:]
+        forecast = model.predict(pd.concat([tail_df[['ds']], future_only], ignore_index=True))
         
         # Extract only future predictions
-        predictions_df = forecast[forecast['ds'] > df['ds'].max()]
+        is_future = (forecast['ds'] > last_ds).to_numpy()
+        predictions_df = forecast[is_future]
+        
+        # Format predictions (column-wise, no per-row pandas access)
+        dates = predictions_df['ds'].dt.strftime('%Y-%m-%d').tolist()
+        yhat = predictions_df['yhat'].to_numpy(dtype=np.float64)
+        predictions = [
+            PredictionPoint(
+                date=date,
+                predicted_value=value,
+                lower_bound=lower,
+                upper_bound=upper,
+                confidence=0.95  # Based on interval_width
+            )
+            for date, value, lower, upper in zip(
+                dates,
+                yhat.tolist(),
+                predictions_df['yhat_lower'].astype(float).tolist(),
+                predictions_df['yhat_upper'].astype(float).tolist()
+            )
+        ]
         
-        # Format predictions
-        predictions = []
-        alerts = []
+        # Check for alerts (one vectorized pass for the whole horizon)
+        alerts = _ALERT_HANDLERS[metric](dates, yhat, _THRESHOLDS[metric])
         
-        # Define thresholds for alerts
-        thresholds = {
-            'ndci': {'high': 0.2, 'critical': 0.3},
-            'ndwi': {'low': 0, 'critical_low': -0.2},
-            'turbidity': {'high': 1.5, 'critical': 2.0},
-            'chla_approx': {'high': 30, 'critical': 50}
-        }
+        # Calculate model metrics from the main model's in-sample residuals over
+        # the last 20% of the history (no second Prophet fit)
+        y_values = tail_df['y'].to_numpy(dtype=np.float64)
+        y_pred = forecast['yhat'].to_numpy(dtype=np.float64)[~is_future]
         
-        for _, row in predictions_df.iterrows():
-            pred_point = {
-                'date': row['ds'].strftime('%Y-%m-%d'),
-                'predicted_value': float(row['yhat']),
-                'lower_bound': float(row['yhat_lower']),
-                'upper_bound': float(row['yhat_upper']),
-                'confidence': 0.95  # Based on interval_width
-            }
-            predictions.append(pred_point)
-            
-            # Check for alerts
-            if metric in thresholds:
-                value = row['yhat']
-                threshold = thresholds[metric]
-                
-                if metric == 'ndci':
-                    if value > threshold['critical']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'critical',
-                            'message': f'ALERTA CRÍTICA: NDCI predicho {value:.3f} indica florecimiento algal severo',
-                            'recommendation': 'Activar protocolo de emergencia. Muestreo in-situ inmediato.'
-                        })
-                    elif value > threshold['high']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'high',
-                            'message': f'ALERTA: NDCI predicho {value:.3f} indica alto riesgo de eutrofización',
-                            'recommendation': 'Incrementar monitoreo. Preparar equipos de muestreo.'
-                        })
-                
-                elif metric == 'turbidity':
-                    if value > threshold['critical']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'critical',
-                            'message': f'ALERTA CRÍTICA: Turbidez predicha {value:.3f} extremadamente alta',
-                            'recommendation': 'Investigar fuentes de sedimentación. Revisar erosión.'
-                        })
-                    elif value > threshold['high']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'high',
-                            'message': f'ALERTA: Turbidez predicha {value:.3f} elevada',
-                            'recommendation': 'Monitorear fuentes de sedimentos.'
-                        })
-                
-                elif metric == 'ndwi':
-                    if value < threshold['critical_low']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'high',
-                            'message': f'ALERTA: NDWI predicho {value:.3f} muy bajo',
-                            'recommendation': 'Verificar niveles de agua. Posible sequía.'
-                        })
-                
-                elif metric == 'chla_approx':
-                    if value > threshold['critical']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'critical',
-                            'message': f'ALERTA CRÍTICA: Clorofila-a predicha {value:.1f} µg/L crítica',
-                            'recommendation': 'Florecimiento algal severo esperado. Alertar autoridades.'
-                        })
-                    elif value > threshold['high']:
-                        alerts.append({
-                            'date': row['ds'].strftime('%Y-%m-%d'),
-                            'severity': 'high',
-                            'message': f'ALERTA: Clorofila-a predicha {value:.1f} µg/L elevada',
-                            'recommendation': 'Riesgo moderado de bloom algal.'
-                        })
-        
-        # Calculate model metrics (on historical data)
-        # Split data for validation
-        train_size = int(len(df) * 0.8)
-        train_df = df[:train_size]
-        test_df = df[train_size:]
-        
-        if len(test_df) > 0:
-            # Retrain on training set
-            val_model = Prophet(
-                daily_seasonality=False,
-                weekly_seasonality=True,
-                yearly_seasonality=False,
-                interval_width=0.95
-            )
-            val_model.fit(train_df)
-            
-            # Predict on test set
-            test_forecast = val_model.predict(test_df[['ds']])
-            
-            # Calculate metrics
-            mae = np.mean(np.abs(test_df['y'].values - test_forecast['yhat'].values))
-            rmse = np.sqrt(np.mean((test_df['y'].values - test_forecast['yhat'].values) ** 2))
-            
-            # Calculate MAPE with protection against division by zero
-            # Use a more robust approach: only calculate for non-zero values
-            y_values = test_df['y'].values
-            y_pred = test_forecast['yhat'].values
-            
-            # Filter out values too close to zero (< 1% of range)
-            y_range = np.max(np.abs(y_values)) - np.min(np.abs(y_values))
-            threshold = max(0.001, y_range * 0.01)
-            
-            mask = np.abs(y_values) > threshold
-            if np.sum(mask) > 0:
-                mape = np.mean(np.abs((y_values[mask] - y_pred[mask]) / y_values[mask])) * 100
-                # Cap MAPE at 100% for display purposes
-                mape = min(mape, 100.0)
-            else:
-                # If all values are too small, use normalized MAE instead
-                # This gives a percentage-like metric
-                if np.max(np.abs(y_values)) > 0:
-                    mape = (mae / np.max(np.abs(y_values))) * 100
-                    mape = min(mape, 100.0)
-                else:
-                    mape = 0.0
+        # Calculate metrics over the error vector in one pass
+        err = y_values - y_pred
+        abs_err = np.abs(err)
+        
+        mae = abs_err.mean()
+        rmse = np.sqrt((err * err).mean())
+        
+        # MAPE only over values clearly away from zero (> 1% of range),
+        # so near-zero indices don't blow up the percentage
+        abs_y = np.abs(y_values)
+        threshold = max(0.001, np.ptp(abs_y) * 0.01)
+        mask = abs_y > threshold
+        
+        if mask.any():
+            mape = (abs_err[mask] / abs_y[mask]).mean() * 100
+        elif (y_max := abs_y.max()) > 0:
+            # If all values are too small, use normalized MAE instead
+            mape = mae / y_max * 100
         else:
-            # Not enough data for validation
-            mae = 0.0
-            rmse = 0.0
             mape = 0.0
         
+        # Cap MAPE at 100% for display purposes
+        mape = min(mape, 100.0)
+        
         # Format historical data for response
         historical_formatted = [
-            {
-                'date': row['ds'].strftime('%Y-%m-%d'),
-                'value': float(row['y'])
-            }
-            for _, row in df.iterrows()
+            {'date': date, 'value': value}
+            for date, value in zip(
+                df['ds'].dt.strftime('%Y-%m-%d').tolist(),
+                df['y'].astype(float).tolist()
+            )
         ]
         
         return {
@@ -586,7 +756,10 @@ class GEEService:
                 'mae': float(mae),
                 'rmse': float(rmse),
                 'mape': float(mape),
-                'data_points': len(df)
+                'data_points': len(df),
+                'method': 'in_sample_tail',
+                # Bounds are approximate: simulated from this many trend samples
+                'uncertainty_samples': _UNCERTAINTY_SAMPLES
             },
             'alerts': alerts,
             'generated_at': datetime.now().isoformat()
@@ -3,40 +3,170 @@ Utility functions for Titicaca Sentinel (Optimized)
 Only contains actively used functions
 """
 
+import math
+import warnings
 import numpy as np
 from typing import Dict, List
 
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to NumPy reductions
+    njit = None
+    prange = range
 
-def validate_coordinates(lat: float, lon: float) -> bool:
+
+def _stats_kernel(a: np.ndarray):
+    """Single pass over `a` (NaNs skipped) using Welford's algorithm
+
+    Returns:
+        Tuple of (mean, std, min, max, count)
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    lo = math.inf
+    hi = -math.inf
+    for x in a:
+        if x == x:  # not NaN
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+    std = math.sqrt(m2 / n) if n else 0.0
+    return mean, std, lo, hi, n
+
+
+def _stats_numpy(a: np.ndarray):
+    """NumPy fallback for _stats_kernel when numba is not installed"""
+    total = a.sum()
+    if total == total:
+        # No NaNs (the sum would propagate them): reduce in place, no mask or copy
+        if a.size == 0:
+            return 0.0, 0.0, math.inf, -math.inf, 0
+        return total / a.size, a.std(), a.min(), a.max(), a.size
+    # np.nan* reductions would each copy the array; filter once instead
+    clean = a[~np.isnan(a)]
+    if clean.size == 0:
+        return 0.0, 0.0, math.inf, -math.inf, 0
+    return clean.mean(), clean.std(), clean.min(), clean.max(), clean.size
+
+
+def _as_float_array(values) -> np.ndarray:
+    """1-D float64 view of `values`, copying only when the input isn't already typed"""
+    if isinstance(values, np.ndarray):
+        a = values if values.dtype == np.float64 else values.astype(np.float64)
+    elif hasattr(values, 'detach'):
+        # PyTorch tensor: share CPU memory instead of iterating elements
+        a = np.asarray(values.detach().cpu().numpy(), dtype=np.float64)
+    elif isinstance(values, memoryview) or hasattr(values, '__array__'):
+        a = np.asarray(values, dtype=np.float64)
+    else:
+        a = np.fromiter(values, dtype=np.float64, count=len(values))
+    return a.ravel()
+
+
+# No fastmath: it would let LLVM assume there are no NaNs and drop the x == x check
+_compute_stats = njit(cache=True)(_stats_kernel) if njit is not None else _stats_numpy
+
+
+def _batch_stats_kernel(a: np.ndarray) -> np.ndarray:
+    """Per-row _stats_kernel over a 2-D array, rows spread across threads"""
+    out = np.empty((a.shape[0], 5), dtype=np.float64)
+    for k in prange(a.shape[0]):
+        mean, std, lo, hi, n = _compute_stats(a[k])
+        if n == 0:
+            mean = std = lo = hi = np.nan
+        out[k, 0] = mean
+        out[k, 1] = std
+        out[k, 2] = lo
+        out[k, 3] = hi
+        out[k, 4] = n
+    return out
+
+
+def _batch_stats_numpy(a: np.ndarray) -> np.ndarray:
+    """NumPy fallback for _batch_stats_kernel (all-NaN rows give NaN stats)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.column_stack((
+            np.nanmean(a, axis=1),
+            np.nanstd(a, axis=1),
+            np.nanmin(a, axis=1),
+            np.nanmax(a, axis=1),
+            np.count_nonzero(~np.isnan(a), axis=1)
+        )).astype(np.float64)
+
+
+_compute_batch_stats = (njit(parallel=True, cache=True)(_batch_stats_kernel)
+                        if njit is not None else _batch_stats_numpy)
+
+
+# Lake Titicaca approximate bounds, one source for every check:
+# [west, south, east, north] as in the processor's bounding box
+LAKE_BBOX = np.array([-70.3, -17.3, -68.4, -15.4], dtype=np.float64)
+_BBOX_LO = LAKE_BBOX[:2].copy()  # (lon_min, lat_min)
+_BBOX_HI = LAKE_BBOX[2:].copy()  # (lon_max, lat_max)
+LON_MIN, LAT_MIN, LON_MAX, LAT_MAX = (float(v) for v in LAKE_BBOX)
+
+
+def _in_bounds_kernel(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Fused bounds check: one loop, no temporary boolean arrays"""
+    out = np.empty(lat.shape[0], dtype=np.bool_)
+    for i in range(lat.shape[0]):
+        # Non-short-circuit & so the four compares don't branch
+        out[i] = ((lon[i] - LON_MIN >= 0) & (lat[i] - LAT_MIN >= 0)
+                  & (LON_MAX - lon[i] >= 0) & (LAT_MAX - lat[i] >= 0))
+    return out
+
+
+_in_bounds_jit = njit(cache=True)(_in_bounds_kernel) if njit is not None else None
+
+
+def validate_coordinates(lat, lon):
     """Validate if coordinates are within Lake Titicaca bounds
     
     Args:
-        lat: Latitude coordinate
-        lon: Longitude coordinate
+        lat: Latitude coordinate(s), scalar or array-like
+        lon: Longitude coordinate(s), same shape as `lat`
         
     Returns:
-        bool: True if coordinates are within lake bounds
+        bool for scalar inputs, otherwise a boolean mask (True = within lake bounds)
     """
-    # Lake Titicaca approximate bounds
-    lat_min, lat_max = -17.3, -15.4
-    lon_min, lon_max = -70.3, -68.4
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    
+    if lat.ndim == 0 and lon.ndim == 0:
+        lat, lon = float(lat), float(lon)
+        return ((lon - LON_MIN >= 0) & (lat - LAT_MIN >= 0)
+                & (LON_MAX - lon >= 0) & (LAT_MAX - lat >= 0))
     
-    return (lat_min <= lat <= lat_max) and (lon_min <= lon <= lon_max)
+    if _in_bounds_jit is not None and lat.ndim == 1 and lat.shape == lon.shape:
+        return _in_bounds_jit(lat, lon)
+    
+    # Four signed distances to the box edges, all checked in one pass
+    # (>= rather than signbit so NaN coordinates stay out of bounds)
+    pt = np.stack(np.broadcast_arrays(lon, lat), axis=-1)
+    d = np.concatenate((pt - _BBOX_LO, _BBOX_HI - pt), axis=-1)
+    return np.all(d >= 0, axis=-1)
 
 
 def calculate_statistics(values: List[float]) -> Dict:
     """Calculate basic statistics from a list of values
     
     Args:
-        values: List of numeric values
+        values: List of numeric values (ndarrays, memoryviews and tensors are used without copying)
         
     Returns:
         Dictionary with mean, std, min, max, and count
     """
-    values_array = np.array(values)
-    values_clean = values_array[~np.isnan(values_array)]
+    a = _as_float_array(values)
+    mean, std, lo, hi, count = _compute_stats(a)
     
-    if len(values_clean) == 0:
+    if count == 0:
         return {
             'mean': None,
             'std': None,
@@ -46,9 +176,25 @@ def calculate_statistics(values: List[float]) -> Dict:
         }
     
     return {
-        'mean': float(np.mean(values_clean)),
-        'std': float(np.std(values_clean)),
-        'min': float(np.min(values_clean)),
-        'max': float(np.max(values_clean)),
-        'count': len(values_clean)
+        'mean': float(mean),
+        'std': float(std),
+        'min': float(lo),
+        'max': float(hi),
+        'count': int(count)
     }
+
+
+def calculate_statistics_batch(values_2d: np.ndarray) -> np.ndarray:
+    """Calculate basic statistics for every row of a 2-D array in one call
+    
+    Args:
+        values_2d: Array of shape (K, N), e.g. one row of pixel values per band
+        
+    Returns:
+        Array of shape (K, 5) with columns mean, std, min, max, count
+        (NaN stats and count 0 for rows without valid values)
+    """
+    a = np.ascontiguousarray(values_2d, dtype=np.float64)
+    if a.ndim != 2:
+        raise ValueError(f"Expected a 2-D array, got shape {a.shape}")
+    return _compute_batch_stats(a)
@@ -2,71 +2,175 @@
 Configuration utilities for Titicaca Sentinel
 """
 
+import math
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Optional, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+_BASE_DIR = Path(__file__).parent.parent
 
-class Config:
-    """Application configuration"""
+# Load .env only in development; deployments (and the start scripts) already
+# export the variables. Explicit path avoids the upward directory search.
+if os.getenv('TITICACA_ENV', 'prod') == 'dev':
+    load_dotenv(_BASE_DIR / '.env', override=False)
+_CONFIG_DIR = _BASE_DIR / 'config'
+
+
+def _env(name: str, default: Optional[str] = None):
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+def _parse_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == '':
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}") from None
+
+
+def _parse_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == '':
+        return default
+    value = raw.strip().casefold()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"{name} must be a boolean (true/false), got {raw!r}")
+
+
+def _env_int(name: str, default: int):
+    return field(default_factory=lambda: _parse_int(name, default))
+
+
+def _env_bool(name: str, default: bool):
+    return field(default_factory=lambda: _parse_bool(name, default))
+
+
+def _lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """Web Mercator XYZ tile containing (lon, lat)"""
+    n = 2 ** zoom
+    lat_rad = math.radians(lat)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _bbox_tile_cover(bbox: Tuple[float, ...], min_zoom: int, max_zoom: int) -> FrozenSet[Tuple[int, int, int]]:
+    """Every (x, y, z) tile intersecting `bbox` ([west, south, east, north])"""
+    west, south, east, north = bbox
+    tiles = set()
+    for z in range(min_zoom, max_zoom + 1):
+        x0, y0 = _lonlat_to_tile(west, north, z)  # top-left
+        x1, y1 = _lonlat_to_tile(east, south, z)  # bottom-right
+        tiles.update((x, y, z) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+    return frozenset(tiles)
+
+
+@dataclass(frozen=True)
+class _Config:
+    """Application configuration (environment read once, at construction)"""
     
     # Google Earth Engine
-    GOOGLE_CLOUD_PROJECT = os.getenv('GOOGLE_CLOUD_PROJECT')
-    EE_SERVICE_ACCOUNT_EMAIL = os.getenv('EE_SERVICE_ACCOUNT_EMAIL')
-    EE_PRIVATE_KEY_PATH = os.getenv('EE_PRIVATE_KEY_PATH')
+    GOOGLE_CLOUD_PROJECT: Optional[str] = _env('GOOGLE_CLOUD_PROJECT')
+    EE_SERVICE_ACCOUNT_EMAIL: Optional[str] = _env('EE_SERVICE_ACCOUNT_EMAIL')
+    EE_PRIVATE_KEY_PATH: Optional[str] = _env('EE_PRIVATE_KEY_PATH')
     
     # API
-    API_HOST = os.getenv('API_HOST', '0.0.0.0')
-    API_PORT = int(os.getenv('API_PORT', 8000))
-    API_RELOAD = os.getenv('API_RELOAD', 'True').lower() == 'true'
+    API_HOST: str = _env('API_HOST', '0.0.0.0')
+    API_PORT: int = _env_int('API_PORT', 8000)
+    API_RELOAD: bool = _env_bool('API_RELOAD', True)
     
     # Streamlit
-    STREAMLIT_PORT = int(os.getenv('STREAMLIT_PORT', 8501))
+    STREAMLIT_PORT: int = _env_int('STREAMLIT_PORT', 8501)
     
     # Data paths
-    BASE_DIR = Path(__file__).parent.parent
-    DATA_DIR = BASE_DIR / 'data'
-    EXPORT_DIR = DATA_DIR / 'exports'
-    CONFIG_DIR = BASE_DIR / 'config'
+    BASE_DIR: Path = _BASE_DIR
+    DATA_DIR: Path = _BASE_DIR / 'data'
+    EXPORT_DIR: Path = _BASE_DIR / 'data' / 'exports'
+    CONFIG_DIR: Path = _CONFIG_DIR
     
     # Analysis parameters
-    CLOUD_COVERAGE_MAX = int(os.getenv('CLOUD_COVERAGE_MAX', 20))
-    ANALYSIS_MONTHS = int(os.getenv('ANALYSIS_MONTHS', 6))
-    UPDATE_FREQUENCY_DAYS = int(os.getenv('UPDATE_FREQUENCY_DAYS', 7))
+    CLOUD_COVERAGE_MAX: int = _env_int('CLOUD_COVERAGE_MAX', 20)
+    ANALYSIS_MONTHS: int = _env_int('ANALYSIS_MONTHS', 6)
+    UPDATE_FREQUENCY_DAYS: int = _env_int('UPDATE_FREQUENCY_DAYS', 7)
     
     # ROI
-    ROI_GEOJSON_PATH = os.getenv(
-        'ROI_GEOJSON_PATH',
-        str(CONFIG_DIR / 'titicaca_roi.geojson')
-    )
+    ROI_GEOJSON_PATH: str = _env('ROI_GEOJSON_PATH', str(_CONFIG_DIR / 'titicaca_roi.geojson'))
     
-    # Lake Titicaca coordinates (approximate center)
-    LAKE_CENTER = {
+    # Lake Titicaca coordinates (approximate center); read-only view, left out
+    # of the hash since mappings aren't hashable
+    LAKE_CENTER: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({
         'lat': -16.0,
         'lon': -69.0
-    }
+    }), hash=False)
     
-    # Bounding box
-    LAKE_BBOX = [-70.3, -17.3, -68.4, -15.4]  # [west, south, east, north]
+    # Bounding box (a tuple, so LAKE_TILE_COVER can't go stale)
+    LAKE_BBOX: Tuple[float, float, float, float] = (-70.3, -17.3, -68.4, -15.4)  # (west, south, east, north)
     
-    @classmethod
-    def ensure_directories(cls):
-        """Create necessary directories"""
-        cls.DATA_DIR.mkdir(exist_ok=True)
-        cls.EXPORT_DIR.mkdir(exist_ok=True)
-        cls.CONFIG_DIR.mkdir(exist_ok=True)
+    # XYZ tiles (zoom 8-10) covering the bounding box, for O(1) tile prefiltering
+    LAKE_TILE_COVER: FrozenSet[Tuple[int, int, int]] = field(init=False)
+    
+    def __post_init__(self):
+        """Validate once at construction so bad values fail at startup"""
+        for name in ('API_PORT', 'STREAMLIT_PORT'):
+            port = getattr(self, name)
+            if not 0 < port < 65536:
+                raise ValueError(f"{name} must be between 1 and 65535, got {port}")
         
-    @classmethod
-    def validate(cls):
-        """Validate configuration"""
-        errors = []
+        west, south, east, north = self.LAKE_BBOX
+        if not (west < east and south < north):
+            raise ValueError(f"LAKE_BBOX must be (west, south, east, north), got {self.LAKE_BBOX}")
         
-        if not cls.GOOGLE_CLOUD_PROJECT:
-            errors.append("GOOGLE_CLOUD_PROJECT not set")
+        object.__setattr__(self, 'LAKE_TILE_COVER', _bbox_tile_cover(self.LAKE_BBOX, 8, 10))
+    
+    def tile_intersects(self, tile_xyz: Tuple[int, int, int]) -> bool:
+        """Whether an (x, y, z) tile (zoom 8-10) overlaps the lake bounding box"""
+        return tuple(tile_xyz) in self.LAKE_TILE_COVER
+    
+    def ensure_directories(self):
+        """Create necessary directories (once per process)"""
+        for directory in (self.DATA_DIR, self.EXPORT_DIR, self.CONFIG_DIR):
+            if directory not in _ensured_dirs:
+                directory.mkdir(exist_ok=True)
+                _ensured_dirs.add(directory)
         
-        return errors
+    def validate(self) -> List[str]:
+        """Validate configuration"""
+        return list(_validate_cached(self.GOOGLE_CLOUD_PROJECT))
+
+
+# Directories already created by ensure_directories in this process
+_ensured_dirs = set()
+
+
+@lru_cache(maxsize=8)
+def _validate_cached(google_cloud_project: Optional[str]) -> Tuple[str, ...]:
+    """Validation errors, memoized on the values they depend on"""
+    errors = []
+    
+    if not google_cloud_project:
+        errors.append("GOOGLE_CLOUD_PROJECT not set")
+    
+    return tuple(errors)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> _Config:
+    """Build the configuration once and reuse the instance"""
+    return _Config()
+
+
+# Global configuration instance (Config kept as the historical name)
+CONFIG = get_config()
+Config = CONFIG
 
 
 if __name__ == "__main__":
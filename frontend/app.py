@@ -3,17 +3,23 @@ TITICACA SENTINEL - Plataforma de Monitoreo de Calidad del Agua
 Sistema de monitoreo del Lago Titicaca usando imágenes satelitales Sentinel-2
 """
 
+import functools
+import plotly.io as pio
 import streamlit as st
 import sys
 import os
 from datetime import datetime
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports. Streamlit re-executes this script
+# on every rerun in the same process, so insert it only once: duplicate entries
+# would be re-scanned on every later import miss.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 # Import modules
 from frontend.utils.config import COLORS, DEFAULT_CLOUD_COVERAGE, DEFAULT_DAYS
-from frontend.utils.api_client import api_client
+from frontend.utils.api_client import get_api_client
 from frontend.utils.styles import get_custom_css
 from frontend.utils.helpers import transform_statistics
 from frontend.components.ui import render_header, render_metric_card, render_info_card
@@ -39,79 +45,151 @@ st.set_page_config(
 # Apply custom CSS
 st.markdown(get_custom_css(), unsafe_allow_html=True)
 
+# Serialize every tab's figures with orjson instead of the stdlib-based PlotlyJSONEncoder
+pio.json.config.default_engine = "orjson"
 
-def render_sidebar(latest_data):
-    """Render sidebar with system info and latest data"""
-    with st.sidebar:
-        st.markdown("### 📊 Última Actualización")
+# Shared across reruns and sessions
+api_client = get_api_client()
+
+
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def _fetch_latest(cloud_coverage: int, days: int) -> dict:
+    """Fetch latest data once and share it across sessions and reruns
+
+    Cached as a resource so hits return the same object with no pickle
+    round-trip; callers must treat it as read-only.
+    The risk map comes back in the same request and is kept under
+    'risk_map' so the risk tab doesn't need a second round trip.
+    """
+    dashboard = api_client.get_dashboard(cloud_coverage=cloud_coverage, days=days)
+    latest = dashboard.get('latest') if dashboard else None
+    if not latest:
+        # Raise so an empty response is never cached
+        raise Exception("El servidor retornó respuesta vacía")
+    
+    # New dict: the response itself lives in the API client's session cache
+    # and must not be modified (a second pass would re-transform the stats)
+    data = {**latest, 'risk_map': dashboard.get('risk_map')}
+    
+    # Transform statistics to frontend format
+    if latest.get('statistics'):
+        data['statistics'] = transform_statistics(latest['statistics'])
+    return data
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_health() -> dict:
+    """Backend liveness, polled at most every 30 seconds"""
+    return api_client.health_check()
+
+
+# Tab label -> renderer, in display order
+TABS = {
+    "🎯 Evaluación de Riesgo": render_risk_tab,
+    "💧 Calidad del Agua": render_water_quality_tab,
+    "📅 Análisis Temporal": render_temporal_tab,
+    "🔄 Comparación Temporal": render_comparison_tab,
+    "🤖 Predicción ML": render_prediction_tab,
+    "📊 Reportes Ejecutivos": render_report_tab,
+    "📈 Estadísticas": render_statistics_tab,
+    "📚 Documentación": render_documentation_tab,
+}
+
+_TAB_LABELS = tuple(TABS)
+
+_SIDEBAR_SYSTEM_MD = """
+**Titicaca Sentinel v2.0**
+
+Monitoreo satelital de calidad del agua del Lago Titicaca.
+
+- 🛰️ Sentinel-2 MSI
+- 🌍 Google Earth Engine
+- 📡 Actualización cada 5 días
+- 🔬 Procesamiento automático
+"""
+
+
+@st.fragment
+def render_active_tab(render_fn, latest_data):
+    """Render one tab; its widget interactions rerun only this fragment"""
+    render_fn(api_client, latest_data)
+
+
+@functools.lru_cache(maxsize=64)
+def _format_iso(value: str) -> str:
+    """Format an ISO timestamp for display (parsed once per distinct value)"""
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return value
+    return dt.strftime('%Y-%m-%d %H:%M UTC')
+
+
+@st.fragment
+def _sidebar_body(latest_data):
+    """Sidebar contents; reruns on its own instead of with the whole app"""
+    st.markdown("### 📊 Última Actualización")
+    
+    if latest_data:
+        # Image info
+        image_date = latest_data.get('image_date', 'N/A')
+        if image_date != 'N/A':
+            image_date = _format_iso(image_date)
         
-        if latest_data:
-            # Image info
-            image_date = latest_data.get('image_date', 'N/A')
-            if image_date != 'N/A':
-                try:
-                    dt = datetime.fromisoformat(image_date.replace('Z', '+00:00'))
-                    image_date = dt.strftime('%Y-%m-%d %H:%M UTC')
-                except:
-                    pass
-            
-            render_info_card(f"""
-            <strong>Fecha:</strong> {image_date}<br>
-            <strong>Satélite:</strong> Sentinel-2<br>
-            <strong>Cobertura:</strong> {latest_data.get('cloud_coverage', 0):.1f}% nubes
-            """)
-            
-            # Quick stats
-            st.markdown("### 📈 Métricas Rápidas")
-            
-            stats = latest_data.get('statistics', {})
-            
-            if 'ndci' in stats:
-                mean_ndci = stats['ndci'].get('mean', 0)
-                render_metric_card(
-                    "NDCI Promedio",
-                    f"{mean_ndci:.3f}",
-                    "Clorofila",
-                    COLORS['primary']
-                )
-            
-            if 'ndwi' in stats:
-                mean_ndwi = stats['ndwi'].get('mean', 0)
-                render_metric_card(
-                    "NDWI Promedio",
-                    f"{mean_ndwi:.3f}",
-                    "Agua",
-                    COLORS['secondary']
-                )
-            
-            if 'turbidity' in stats:
-                mean_turb = stats['turbidity'].get('mean', 0)
-                render_metric_card(
-                    "Turbidez Promedio",
-                    f"{mean_turb:.3f}",
-                    "Sedimentos",
-                    COLORS['accent']
-                )
+        render_info_card(f"""
+        <strong>Fecha:</strong> {image_date}<br>
+        <strong>Satélite:</strong> Sentinel-2<br>
+        <strong>Cobertura:</strong> {latest_data.get('cloud_coverage', 0):.1f}% nubes
+        """)
         
-        else:
-            st.warning("⚠️ No hay datos disponibles")
+        # Quick stats
+        st.markdown("### 📈 Métricas Rápidas")
         
-        # System info
-        st.markdown("---")
-        st.markdown("### ℹ️ Sistema")
-        st.markdown("""
-        **Titicaca Sentinel v2.0**
+        stats = latest_data.get('statistics', {})
         
-        Monitoreo satelital de calidad del agua del Lago Titicaca.
+        if 'ndci' in stats:
+            mean_ndci = stats['ndci'].get('mean', 0)
+            render_metric_card(
+                "NDCI Promedio",
+                f"{mean_ndci:.3f}",
+                "Clorofila",
+                COLORS['primary']
+            )
         
-        - 🛰️ Sentinel-2 MSI
-        - 🌍 Google Earth Engine
-        - 📡 Actualización cada 5 días
-        - 🔬 Procesamiento automático
-        """)
+        if 'ndwi' in stats:
+            mean_ndwi = stats['ndwi'].get('mean', 0)
+            render_metric_card(
+                "NDWI Promedio",
+                f"{mean_ndwi:.3f}",
+                "Agua",
+                COLORS['secondary']
+            )
         
-        st.markdown("---")
-        st.markdown("*Desarrollado con FastAPI + Streamlit*")
+        if 'turbidity' in stats:
+            mean_turb = stats['turbidity'].get('mean', 0)
+            render_metric_card(
+                "Turbidez Promedio",
+                f"{mean_turb:.3f}",
+                "Sedimentos",
+                COLORS['accent']
+            )
+    
+    else:
+        st.warning("⚠️ No hay datos disponibles")
+    
+    # System info
+    st.markdown("---")
+    st.markdown("### ℹ️ Sistema")
+    st.markdown(_SIDEBAR_SYSTEM_MD)
+    
+    st.markdown("---")
+    st.markdown("*Desarrollado con FastAPI + Streamlit*")
+
+
+def render_sidebar(latest_data):
+    """Render sidebar with system info and latest data"""
+    with st.sidebar:
+        _sidebar_body(latest_data)
 
 
 def main():
@@ -123,7 +201,8 @@ def main():
     # Sidebar: cache controls
     with st.sidebar:
         if st.button("🗑️ Limpiar Caché", key="sidebar_clear_cache_button"):
-            # Clear Streamlit cache and API client cache and session stored data
+            # Clear Streamlit cache (shared latest data included) and API client cache
+            _fetch_latest.clear()
             try:
                 st.cache_data.clear()
             except Exception:
@@ -132,49 +211,30 @@ def main():
                 api_client.clear_cache()
             except Exception:
                 pass
-            if "latest_data" in st.session_state:
-                st.session_state.pop("latest_data")
             st.success("✅ Caché limpiado")
             st.rerun()
 
-    # Ensure we only load latest data once per Streamlit session
-    latest_data = st.session_state.get("latest_data")
-    if not latest_data:
-        max_retries = 2
-        last_error = None
+    # Latest data is cached across sessions, so only the first user pays for processing
+    latest_data = None
+    max_retries = 2
+    last_error = None
 
-        for attempt in range(max_retries):
-            try:
-                spinner_msg = "⏳ Procesando imágenes satelitales de los últimos 7 días... (2-3 minutos)"
-                if attempt > 0:
-                    spinner_msg = f"🔄 Reintentando ({attempt + 1}/{max_retries})... (esto puede tardar 2-3 minutos)"
-
-                with st.spinner(spinner_msg):
-                    data = api_client.get_latest_data(
-                        cloud_coverage=DEFAULT_CLOUD_COVERAGE,
-                        days=DEFAULT_DAYS
-                    )
-
-                # Check if we got data
-                if data:
-                    # Transform statistics to frontend format
-                    if 'statistics' in data and data['statistics']:
-                        data['statistics'] = transform_statistics(data['statistics'])
-                    
-                    latest_data = data
-                    st.session_state["latest_data"] = latest_data
-                    break
-                else:
-                    last_error = "El servidor retornó respuesta vacía"
-                    if attempt < max_retries - 1:
-                        st.warning(f"⚠️ Intento {attempt + 1} falló, reintentando...")
-
-            except Exception as e:
-                last_error = str(e)
-                if attempt < max_retries - 1:
-                    st.warning(f"⚠️ Intento {attempt + 1} falló: {last_error}")
-                else:
-                    st.error(f"❌ Error después de {max_retries} intentos: {last_error}")
+    for attempt in range(max_retries):
+        try:
+            spinner_msg = "⏳ Procesando imágenes satelitales de los últimos 7 días... (2-3 minutos)"
+            if attempt > 0:
+                spinner_msg = f"🔄 Reintentando ({attempt + 1}/{max_retries})... (esto puede tardar 2-3 minutos)"
+
+            with st.spinner(spinner_msg):
+                latest_data = _fetch_latest(DEFAULT_CLOUD_COVERAGE, DEFAULT_DAYS)
+            break
+
+        except Exception as e:
+            last_error = str(e)
+            if attempt < max_retries - 1:
+                st.warning(f"⚠️ Intento {attempt + 1} falló: {last_error}")
+            else:
+                st.error(f"❌ Error después de {max_retries} intentos: {last_error}")
     
     # Render sidebar
     render_sidebar(latest_data)
@@ -191,49 +251,26 @@ def main():
                 st.rerun()
         with col2:
             with st.spinner("Verificando backend..."):
-                health = api_client.health_check()
+                try:
+                    health = _cached_health()
+                except Exception:
+                    health = None
                 if health:
                     st.success(f"✅ Backend activo: {health.get('status')}")
                 else:
                     st.error("❌ Backend no responde")
         return
     
-    # Main tabs
-    tabs = st.tabs([
-        "🎯 Evaluación de Riesgo",
-        "💧 Calidad del Agua",
-        "📅 Análisis Temporal",
-        "🔄 Comparación Temporal",
-        "� Predicción ML",
-        "�📊 Reportes Ejecutivos",
-        "📈 Estadísticas",
-        "📚 Documentación"
-    ])
-
-    with tabs[0]:
-        render_risk_tab(api_client, latest_data)
-    
-    with tabs[1]:
-        render_water_quality_tab(api_client, latest_data)
-    
-    with tabs[2]:
-        render_temporal_tab(api_client, latest_data)
-    
-    with tabs[3]:
-        render_comparison_tab(api_client, latest_data)
-    
-    with tabs[4]:
-        render_prediction_tab(api_client, latest_data)
-    
-    with tabs[5]:
-        render_report_tab(api_client, latest_data)
-
-    with tabs[6]:
-        render_statistics_tab(api_client, latest_data)
-
-    with tabs[7]:
-        render_documentation_tab(api_client, latest_data)
-    
+    # Main tabs: only the selected one is rendered (st.tabs would run all of them)
+    active_tab = st.radio(
+        "Sección",
+        _TAB_LABELS,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
+    st.markdown("---")
+    render_active_tab(TABS[active_tab], latest_data)
 
 
 if __name__ == "__main__":
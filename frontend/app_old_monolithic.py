@@ -4,28 +4,43 @@ Plataforma avanzada de monitoreo de calidad del agua para el Lago Titicaca
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 import requests
 import folium
-import folium.plugins
-from streamlit_folium import st_folium
+from folium.plugins import MeasureControl
+import streamlit.components.v1 as components
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import json
+import logging
 from typing import Dict, List
 import sys
 import os
+import textwrap
+import threading
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from shapely.geometry import mapping, shape
+except ImportError:  # Optional: draw the full-resolution boundary
+    mapping = shape = None
+
+# Add parent directory to path for imports. Streamlit re-executes this script
+# on every rerun in the same process, so insert it only once: duplicate entries
+# would be re-scanned on every later import miss.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 # Import utils modules
 from frontend.utils.config import COLORS, API_BASE_URL, MAP_CENTER, MAP_DEFAULT_ZOOM
 from frontend.utils.api_client import api_client
 from frontend.utils.helpers import format_number, get_risk_interpretation
 
+logger = logging.getLogger(__name__)
+
 # Page configuration
 st.set_page_config(
     page_title="Titicaca Sentinel | Monitoreo de Calidad del Agua",
@@ -34,6 +49,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Lean default template for every figure (no per-figure theme resolution)
+pio.templates.default = "plotly_white"
+# Serialize figures with orjson instead of the stdlib-based PlotlyJSONEncoder
+pio.json.config.default_engine = "orjson"
+
 # Professional Color Palette
 COLORS = {
     'primary': '#0066CC',      # Deep Blue
@@ -63,8 +83,15 @@ COLORS = {
     'chl_high': '#E74C3C',
 }
 
-# Custom CSS
-st.markdown(f"""
+# rgba() templates per palette color, parsed from hex once; fill in with .format(a=alpha)
+RGBA = {
+    name: f"rgba({int(hex_[1:3], 16)}, {int(hex_[3:5], 16)}, {int(hex_[5:7], 16)}, {{a}})"
+    for name, hex_ in COLORS.items()
+    if hex_.startswith('#') and len(hex_) == 7
+}
+
+# Custom CSS (colors substituted once; reruns reuse the finished string)
+_CSS_TEMPLATE = """
 <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
@@ -76,12 +103,12 @@ st.markdown(f"""
     
     /* Main Container */
     .main {{
-        background-color: {COLORS['background']};
+        background-color: {background};
     }}
     
     /* Header Styles */
     .header-container {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['secondary']} 100%);
+        background: linear-gradient(135deg, {primary} 0%, {secondary} 100%);
         padding: 2.5rem 2rem;
         border-radius: 16px;
         margin-bottom: 2rem;
@@ -111,7 +138,7 @@ st.markdown(f"""
         padding: 1.5rem;
         border-radius: 12px;
         box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
-        border-left: 4px solid {COLORS['primary']};
+        border-left: 4px solid {primary};
         margin-bottom: 1rem;
         transition: transform 0.2s, box-shadow 0.2s;
     }}
@@ -121,10 +148,16 @@ st.markdown(f"""
         box-shadow: 0 4px 12px rgba(0, 0, 0, 0.12);
     }}
     
+    .metric-grid {{
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }}
+    
     .metric-label {{
         font-size: 0.875rem;
         font-weight: 600;
-        color: {COLORS['text']};
+        color: {text};
         text-transform: uppercase;
         letter-spacing: 0.5px;
         margin-bottom: 0.5rem;
@@ -133,7 +166,7 @@ st.markdown(f"""
     .metric-value {{
         font-size: 2rem;
         font-weight: 700;
-        color: {COLORS['primary']};
+        color: {primary};
         line-height: 1.2;
     }}
     
@@ -147,14 +180,14 @@ st.markdown(f"""
         background: white;
         padding: 1.25rem;
         border-radius: 12px;
-        border: 1px solid {COLORS['light']};
+        border: 1px solid {light};
         margin-bottom: 1rem;
     }}
     
     .info-card-title {{
         font-size: 1rem;
         font-weight: 600;
-        color: {COLORS['dark']};
+        color: {dark};
         margin-bottom: 0.75rem;
         display: flex;
         align-items: center;
@@ -162,7 +195,7 @@ st.markdown(f"""
     
     .info-card-content {{
         font-size: 0.9rem;
-        color: {COLORS['text']};
+        color: {text};
         line-height: 1.6;
     }}
     
@@ -179,26 +212,26 @@ st.markdown(f"""
     
     .risk-low {{
         background-color: rgba(46, 204, 113, 0.15);
-        color: {COLORS['risk_low']};
+        color: {risk_low};
     }}
     
     .risk-medium {{
         background-color: rgba(243, 156, 18, 0.15);
-        color: {COLORS['risk_medium']};
+        color: {risk_medium};
     }}
     
     .risk-high {{
         background-color: rgba(231, 76, 60, 0.15);
-        color: {COLORS['risk_high']};
+        color: {risk_high};
     }}
     
     /* Sidebar Styles */
     section[data-testid="stSidebar"] {{
-        background-color: {COLORS['dark']};
+        background-color: {dark};
     }}
     
     section[data-testid="stSidebar"] > div {{
-        background-color: {COLORS['dark']};
+        background-color: {dark};
     }}
     
     section[data-testid="stSidebar"] .block-container {{
@@ -219,7 +252,7 @@ st.markdown(f"""
     
     /* Button Styles */
     .stButton > button {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['secondary']} 100%);
+        background: linear-gradient(135deg, {primary} 0%, {secondary} 100%);
         color: white;
         border: none;
         border-radius: 8px;
@@ -250,11 +283,32 @@ st.markdown(f"""
         padding: 0 24px;
         background-color: transparent;
         font-weight: 500;
-        color: {COLORS['text']};
+        color: {text};
     }}
     
     .stTabs [aria-selected="true"] {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['secondary']} 100%);
+        background: linear-gradient(135deg, {primary} 0%, {secondary} 100%);
+        color: white;
+    }}
+    
+    /* Section selector (horizontal radio) styled like the tab strip; scoped to
+       the main area so sidebar radios keep the default theme */
+    [data-testid="stMain"] div[role="radiogroup"] {{
+        gap: 8px;
+        background-color: white;
+        padding: 0.5rem;
+        border-radius: 12px;
+    }}
+    
+    [data-testid="stMain"] div[role="radiogroup"] label {{
+        padding: 0.5rem 1.5rem;
+        border-radius: 8px;
+        font-weight: 500;
+        color: {text};
+    }}
+    
+    [data-testid="stMain"] div[role="radiogroup"] label:has(input:checked) {{
+        background: linear-gradient(135deg, {primary} 0%, {secondary} 100%);
         color: white;
     }}
     
@@ -270,7 +324,7 @@ st.markdown(f"""
     .legend-title {{
         font-size: 0.95rem;
         font-weight: 600;
-        color: {COLORS['dark']};
+        color: {dark};
         margin-bottom: 0.75rem;
     }}
     
@@ -289,7 +343,7 @@ st.markdown(f"""
     
     .legend-label {{
         font-size: 0.875rem;
-        color: {COLORS['text']};
+        color: {text};
     }}
     
     /* Stats Table */
@@ -302,7 +356,7 @@ st.markdown(f"""
     }}
     
     .stats-table th {{
-        background-color: {COLORS['primary']};
+        background-color: {primary};
         color: white;
         padding: 1rem;
         text-align: left;
@@ -314,13 +368,13 @@ st.markdown(f"""
     
     .stats-table td {{
         padding: 0.875rem 1rem;
-        border-bottom: 1px solid {COLORS['light']};
+        border-bottom: 1px solid {light};
         font-size: 0.9rem;
-        color: {COLORS['text']};
+        color: {text};
     }}
     
     .stats-table tr:hover {{
-        background-color: {COLORS['background']};
+        background-color: {background};
     }}
     
     /* Alert Styles */
@@ -334,20 +388,20 @@ st.markdown(f"""
     
     .alert-info {{
         background-color: rgba(0, 163, 224, 0.1);
-        border-left: 4px solid {COLORS['secondary']};
-        color: {COLORS['text']};
+        border-left: 4px solid {secondary};
+        color: {text};
     }}
     
     .alert-success {{
         background-color: rgba(46, 204, 113, 0.1);
-        border-left: 4px solid {COLORS['success']};
-        color: {COLORS['text']};
+        border-left: 4px solid {success};
+        color: {text};
     }}
     
     .alert-warning {{
         background-color: rgba(243, 156, 18, 0.1);
-        border-left: 4px solid {COLORS['warning']};
-        color: {COLORS['text']};
+        border-left: 4px solid {warning};
+        color: {text};
     }}
     
     /* Hide Streamlit Branding */
@@ -361,19 +415,25 @@ st.markdown(f"""
     }}
     
     ::-webkit-scrollbar-track {{
-        background: {COLORS['light']};
+        background: {light};
     }}
     
     ::-webkit-scrollbar-thumb {{
-        background: {COLORS['primary']};
+        background: {primary};
         border-radius: 5px;
     }}
     
     ::-webkit-scrollbar-thumb:hover {{
-        background: {COLORS['secondary']};
+        background: {secondary};
     }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource(show_spinner=False)
+def _get_css():
+    return _CSS_TEMPLATE.format(**COLORS)
+
+st.markdown(_get_css(), unsafe_allow_html=True)
 
 # Helper functions
 def create_map(center=MAP_CENTER, zoom=MAP_DEFAULT_ZOOM):
@@ -401,52 +461,238 @@ def create_map(center=MAP_CENTER, zoom=MAP_DEFAULT_ZOOM):
     
     return m
 
-def create_legend_html(layer_type):
-    """Create custom legend HTML"""
-    legends = {
-        "Mapa de Riesgo": {
-            "title": "Nivel de Riesgo Ambiental",
-            "items": [
-                (COLORS['risk_low'], "Condiciones Normales", "Indicadores bajo percentil 70"),
-                (COLORS['risk_medium'], "Atención Requerida", "Indicadores entre percentil 70-90"),
-                (COLORS['risk_high'], "Zona Crítica", "Indicadores sobre percentil 90"),
-            ]
-        },
-        "NDCI (Clorofila)": {
-            "title": "Índice de Clorofila Normalizado",
-            "items": [
-                ("#3498DB", "Baja Concentración", "NDCI < -0.2 | Aguas oligotróficas"),
-                ("#2ECC71", "Concentración Moderada", "-0.2 ≤ NDCI ≤ 0.2 | Aguas mesotróficas"),
-                ("#E74C3C", "Alta Concentración", "NDCI > 0.2 | Posible eutrofización"),
-            ]
-        },
-        "NDWI (Agua)": {
-            "title": "Índice Normalizado de Agua",
-            "items": [
-                ("#E74C3C", "Tierra/Vegetación", "NDWI < 0 | Áreas terrestres"),
-                ("#F39C12", "Agua Turbia", "0 ≤ NDWI ≤ 0.3 | Sedimentos suspendidos"),
-                ("#3498DB", "Agua Clara", "NDWI > 0.3 | Cuerpo de agua definido"),
-            ]
-        },
-        "Turbidez": {
-            "title": "Nivel de Turbidez Relativa",
-            "items": [
-                ("#3498DB", "Baja Turbidez", "Ratio < 0.5 | Buena claridad"),
-                ("#F39C12", "Turbidez Moderada", "0.5 ≤ Ratio ≤ 1.5 | Sedimentos moderados"),
-                ("#8B4513", "Alta Turbidez", "Ratio > 1.5 | Alta carga de sedimentos"),
-            ]
-        }
-    }
+# ~100 m in degrees: invisible at map zoom, far fewer vertices for Folium to draw
+ROI_SIMPLIFY_TOLERANCE = 0.001
+
+# Cached API calls: widget changes (e.g. the layer selector) reuse these instead
+# of re-requesting GEE processing; "Actualizar Datos" clears st.cache_data
+@st.cache_data(ttl=600, show_spinner=False)
+def _risk_map(cloud_coverage, days, months):
+    return api_client.get_risk_map(cloud_coverage=cloud_coverage, days=days, months=months)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _latest(cloud_coverage, days, months):
+    return api_client.get_latest_data(cloud_coverage=cloud_coverage, days=days, months=months)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _time_series(lat, lon, cloud_coverage, days, months):
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=days if days else months * 30)
+    return api_client.get_time_series(
+        start_date=start_date.isoformat(),
+        end_date=end_date.isoformat(),
+        lat=lat,
+        lon=lon,
+        cloud_coverage=cloud_coverage
+    )
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _timeseries_csv(df):
+    """CSV download bytes, serialized once per time series (formatted while writing)"""
+    return df.to_csv(index=False, date_format='%Y-%m-%d', float_format='%.4f').encode('utf-8')
+
+@st.cache_resource(show_spinner=False)
+def _roi():
+    """Static lake boundary: fetched once per process, simplified for Folium"""
+    roi = api_client.get_roi()
+    if roi and shape is not None:
+        for feature in roi.get('features', []):
+            geom = shape(feature['geometry']).simplify(ROI_SIMPLIFY_TOLERANCE, preserve_topology=True)
+            feature['geometry'] = mapping(geom)
+    return roi
+
+# Selectable map layers: (data source, overlay name, tile URL getter, warning when unavailable)
+MAP_LAYERS = {
+    "Mapa de Riesgo": ('risk', 'Environmental Risk', lambda d: d['tile_url'], None),
+    "NDCI (Clorofila)": ('latest', 'NDCI (Chlorophyll)', lambda d: d['tile_urls'].get('ndci', ''),
+                         "Capa NDCI no disponible para esta fecha"),
+    "NDWI (Agua)": ('latest', 'NDWI (Water)', lambda d: d['tile_urls'].get('ndwi', ''),
+                    "Capa NDWI no disponible para esta fecha"),
+    "Turbidez": ('latest', 'Turbidity', lambda d: d['tile_urls'].get('turbidity', ''),
+                 "Capa de Turbidez no disponible para esta fecha"),
+}
+_LAYER_NAMES = tuple(MAP_LAYERS)
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def render_map_html(layer_type, overlay_url, _roi_data, include_measure=False):
+    """Build the Folium map once per (layer, tile URL, measure tool) and return its rendered HTML
     
-    legend = legends.get(layer_type, legends["Mapa de Riesgo"])
+    Reruns (slider changes, other widgets) reuse the string, skipping Folium's
+    Jinja render; the ROI is static so it is left out of the cache key.
+    """
+    m = create_map()
     
-    html = f"""
-    <div class="legend-container">
-        <div class="legend-title">{legend['title']}</div>
+    # Add ROI
+    if _roi_data:
+        folium.GeoJson(
+            _roi_data,
+            name='Lake Titicaca',
+            style_function=lambda x: {
+                'fillColor': 'transparent',
+                'color': '#00A3E0',
+                'weight': 3,
+                'opacity': 0.8
+            },
+            tooltip='Lake Titicaca (7,286.56 km²)'
+        ).add_to(m)
+    
+    # Add selected layer
+    if overlay_url:
+        folium.TileLayer(
+            tiles=overlay_url,
+            attr='Google Earth Engine',
+            name=MAP_LAYERS[layer_type][1],
+            overlay=True,
+            control=True,
+            opacity=0.7
+        ).add_to(m)
+    
+    # Add layer control (always useful: create_map adds three base layers)
+    folium.LayerControl(position='topright').add_to(m)
+    
+    # Measuring plugin only on request; it ships its own JS/CSS with every map
+    if include_measure:
+        MeasureControl(position='topleft', primary_length_unit='kilometers').add_to(m)
+    
+    return m.get_root().render()
+
+
+# Session-state key prefixes: prewarm finished / prewarm thread running
+_PREWARMED_PREFIX = "_layers_prewarmed_"
+_PREWARMING_PREFIX = "_layers_prewarming_"
+
+
+def _prewarm_layers(cloud_coverage, days, months, roi_data, include_measure):
+    """Fill the latest-data and map HTML caches for the index layers
+
+    Returns:
+        True if every layer was rendered, False otherwise
     """
+    try:
+        latest = _latest(cloud_coverage, days, months)
+        if not latest:
+            return False
+        for layer_type, (source, _, tile_url_of, _) in MAP_LAYERS.items():
+            overlay_url = tile_url_of(latest) if source == 'latest' else ''
+            if overlay_url:
+                render_map_html(layer_type, overlay_url, roi_data, include_measure)
+        return True
+    except Exception as e:
+        logger.warning("Layer prewarm failed: %s", e)
+        return False
+
+
+def _layer_prewarm_worker(period_key, *args):
+    """Thread body: mark the period prewarmed only once _prewarm_layers succeeds
+
+    The in-flight flag holds the thread that set it; if a refresh replaced it
+    with a newer run, this (stale) run leaves both flags to that run.
+    """
+    inflight_key = _PREWARMING_PREFIX + period_key
+    ok = False
+    try:
+        ok = _prewarm_layers(*args)
+    finally:
+        if st.session_state.get(inflight_key) is threading.current_thread():
+            if ok:
+                st.session_state[_PREWARMED_PREFIX + period_key] = True
+            del st.session_state[inflight_key]
+
+
+def _start_layer_prewarm(cloud_coverage, days, months, include_measure):
+    """Warm the other layers in the background, once per session and period"""
+    period_key = f"{cloud_coverage}_{days}_{months}_{include_measure}"
+    if (st.session_state.get(_PREWARMED_PREFIX + period_key)
+            or st.session_state.get(_PREWARMING_PREFIX + period_key)):
+        return
+    
+    thread = threading.Thread(
+        target=_layer_prewarm_worker,
+        args=(period_key, cloud_coverage, days, months, _roi(), include_measure),
+        daemon=True
+    )
+    # In-flight guard so reruns don't start a second thread; the run clears it
+    st.session_state[_PREWARMING_PREFIX + period_key] = thread
+    # Attach this session's context so the cached calls (and session_state) behave as in the script thread
+    add_script_run_ctx(thread)
+    thread.start()
+
+
+@st.fragment
+def _risk_map_fragment(risk_data, cloud_coverage, days, months, measure_tool):
+    """Layer selector, map and legend of the risk section"""
+    # Layer selector
+    st.markdown("### 🎨 Layer Selection")
+    layer_type = st.selectbox(
+        "Select visualization layer:",
+        _LAYER_NAMES,
+        key="layer_selector",
+        label_visibility="collapsed"
+    )
+    
+    # Overlay tile URL for the selected layer (index layers need the latest data)
+    source, _, tile_url_of, unavailable_msg = MAP_LAYERS[layer_type]
+    if source == 'risk':
+        layer_data = risk_data
+    else:
+        with st.spinner(f"Loading {layer_type}..."):
+            layer_data = _latest(cloud_coverage, days, months)
     
-    for color, label, description in legend['items']:
-        html += f"""
+    overlay_url = tile_url_of(layer_data) if layer_data else ''
+    if layer_data and not overlay_url and unavailable_msg:
+        st.warning(unavailable_msg)
+    
+    # Display map (pre-rendered HTML, cached per layer + tile URL)
+    roi_data = _roi()
+    components.html(render_map_html(layer_type, overlay_url, roi_data, measure_tool), height=600)
+    
+    # Legend
+    st.markdown(create_legend_html(layer_type), unsafe_allow_html=True)
+
+
+# Legend definitions per layer: title and (color, label, description) items
+_LEGENDS = {
+    "Mapa de Riesgo": {
+        "title": "Nivel de Riesgo Ambiental",
+        "items": [
+            (COLORS['risk_low'], "Condiciones Normales", "Indicadores bajo percentil 70"),
+            (COLORS['risk_medium'], "Atención Requerida", "Indicadores entre percentil 70-90"),
+            (COLORS['risk_high'], "Zona Crítica", "Indicadores sobre percentil 90"),
+        ]
+    },
+    "NDCI (Clorofila)": {
+        "title": "Índice de Clorofila Normalizado",
+        "items": [
+            ("#3498DB", "Baja Concentración", "NDCI < -0.2 | Aguas oligotróficas"),
+            ("#2ECC71", "Concentración Moderada", "-0.2 ≤ NDCI ≤ 0.2 | Aguas mesotróficas"),
+            ("#E74C3C", "Alta Concentración", "NDCI > 0.2 | Posible eutrofización"),
+        ]
+    },
+    "NDWI (Agua)": {
+        "title": "Índice Normalizado de Agua",
+        "items": [
+            ("#E74C3C", "Tierra/Vegetación", "NDWI < 0 | Áreas terrestres"),
+            ("#F39C12", "Agua Turbia", "0 ≤ NDWI ≤ 0.3 | Sedimentos suspendidos"),
+            ("#3498DB", "Agua Clara", "NDWI > 0.3 | Cuerpo de agua definido"),
+        ]
+    },
+    "Turbidez": {
+        "title": "Nivel de Turbidez Relativa",
+        "items": [
+            ("#3498DB", "Baja Turbidez", "Ratio < 0.5 | Buena claridad"),
+            ("#F39C12", "Turbidez Moderada", "0.5 ≤ Ratio ≤ 1.5 | Sedimentos moderados"),
+            ("#8B4513", "Alta Turbidez", "Ratio > 1.5 | Alta carga de sedimentos"),
+        ]
+    }
+}
+
+def _build_legend_html(legend):
+    """Assemble one legend's HTML with a single join"""
+    parts = [f"""
+    <div class="legend-container">
+        <div class="legend-title">{legend['title']}</div>
+    """]
+    parts.extend(f"""
         <div class="legend-item">
             <div class="legend-color" style="background-color: {color};"></div>
             <div>
@@ -454,20 +700,422 @@ def create_legend_html(layer_type):
                 <div style="font-size: 0.75rem; color: #7f8c8d;">{description}</div>
             </div>
         </div>
-        """
+        """ for color, label, description in legend['items'])
+    parts.append("</div>")
+    return "".join(parts)
+
+# Finished legend HTML, built once at import time
+LEGEND_HTML = {name: _build_legend_html(legend) for name, legend in _LEGENDS.items()}
+
+def create_legend_html(layer_type):
+    """Create custom legend HTML"""
+    return LEGEND_HTML.get(layer_type, LEGEND_HTML["Mapa de Riesgo"])
+
+# Main sections, shown one at a time
+TAB_NAMES = (
+    "Evaluación de Riesgo",
+    "Calidad del Agua",
+    "Análisis Temporal",
+    "Estadísticas",
+    "Documentación Técnica"
+)
+
+# Static HTML blocks
+_HEADER_HTML = """
+<div class="header-container">
+    <h1 class="main-title">TITICACA SENTINEL</h1>
+    <p class="subtitle">Sistema de Monitoreo de Calidad del Agua | Lago Titicaca</p>
+</div>
+"""
+
+_ABOUT_HTML = """
+<div class="info-card-content">
+    <strong>Fuente de Datos:</strong> Sentinel-2 SR<br>
+    <strong>Plataforma:</strong> Google Earth Engine<br>
+    <strong>Resolución:</strong> 10-20m<br>
+    <strong>Cobertura:</strong> Lago Titicaca<br>
+    <strong>Índices:</strong> NDWI, NDCI, Turbidez, Clorofila-a
+</div>
+"""
+
+# Sidebar processing info card; only the period, cloud filter and time lines vary
+SIDEBAR_INFO_PREFIX = """
+<div class="info-card">
+    <div style="font-size: 0.85rem;">
+"""
+SIDEBAR_INFO_SUFFIX = """
+        <strong>Caché TTL:</strong> 10 minutes
+    </div>
+</div>
+"""
+
+# Time series columns: DataFrame column -> API field
+_TS_COLUMNS = {
+    'NDCI': 'ndci',
+    'Chlorophyll-a': 'chla_approx',
+    'Turbidity': 'turbidity',
+    'NDWI': 'ndwi',
+}
+
+# Display formats for the time series table
+_TS_TABLE_FORMAT = {
+    'Date': lambda d: d.strftime('%Y-%m-%d'),
+    **{column: '{:.4f}' for column in _TS_COLUMNS},
+}
+
+# Detailed statistics: indicator tab label -> statistics key prefix
+INDICATOR_PREFIXES = {
+    'NDCI (Chlorophyll Index)': 'NDCI',
+    'NDWI (Water Index)': 'NDWI',
+    'Turbidity': 'Turbidity',
+    'CI-green': 'CI_green',
+    'TSM (Total Suspended Matter)': 'TSM',
+    'Chlorophyll-a (Approx.)': 'Chla_approx',
+}
+_STAT_KEYS = ('mean', 'p10', 'p50', 'p90', 'stdDev')
+
+# Detailed statistics card: metric table, then the indicator's interpretation
+_STATS_TABLE_TMPL = """
+<table class="stats-table">
+    <thead>
+        <tr>
+            <th>Metric</th>
+            <th>Value</th>
+        </tr>
+    </thead>
+    <tbody>
+        <tr>
+            <td><strong>Mean (Average)</strong></td>
+            <td>{mean}</td>
+        </tr>
+        <tr>
+            <td><strong>10th Percentile</strong></td>
+            <td>{p10}</td>
+        </tr>
+        <tr>
+            <td><strong>Median (50th Percentile)</strong></td>
+            <td>{p50}</td>
+        </tr>
+        <tr>
+            <td><strong>90th Percentile</strong></td>
+            <td>{p90}</td>
+        </tr>
+        <tr>
+            <td><strong>Standard Deviation</strong></td>
+            <td>{std}</td>
+        </tr>
+        <tr>
+            <td><strong>Range (P10-P90)</strong></td>
+            <td>{spread}</td>
+        </tr>
+    </tbody>
+</table>
+"""
+
+# Interpretation per indicator ({mean} formatted, {level} from _INTERPRETATION_LEVEL);
+# dedented once here since it is appended to the table rather than rendered alone
+_INTERPRETATION_TMPL = {name: textwrap.dedent(tmpl) for name, tmpl in {
+    'NDCI (Chlorophyll Index)': """
+    <div class="info-card">
+        The mean NDCI value of <strong>{mean}</strong> indicates
+        {level}
+        chlorophyll concentration. Values closer to 1 indicate higher chlorophyll presence,
+        which may suggest eutrophication or algal blooms.
+    </div>
+    """,
+    'NDWI (Water Index)': """
+    <div class="info-card">
+        The mean NDWI value of <strong>{mean}</strong> suggests
+        {level}.
+        Higher NDWI values (>0.3) typically indicate clear, deep water.
+    </div>
+    """,
+    'Turbidity': """
+    <div class="info-card">
+        Average turbidity of <strong>{mean}</strong> indicates
+        {level}
+        sediment concentration. Lower values suggest clearer water with less suspended particles.
+    </div>
+    """,
+    'CI-green': """
+    <div class="info-card">
+        The CI-green index value of <strong>{mean}</strong>
+        helps detect aquatic vegetation. Positive values may indicate presence of algae or aquatic plants.
+    </div>
+    """,
+    'TSM (Total Suspended Matter)': """
+    <div class="info-card">
+        TSM mean value of <strong>{mean}</strong> represents
+        the concentration of suspended particles. Higher values may indicate erosion, pollution,
+        or resuspension of sediments.
+    </div>
+    """,
+    'Chlorophyll-a (Approx.)': """
+    <div class="info-card">
+        Estimated chlorophyll-a concentration of <strong>{mean} mg/m³</strong>
+        provides an approximation of algal biomass. Values >10 mg/m³ may indicate eutrophic conditions.
+    </div>
+    """,
+}.items()}
+_INTERPRETATION_LEVEL = {
+    'NDCI (Chlorophyll Index)': lambda m: 'high' if m > 0.2 else 'moderate' if m > -0.2 else 'low',
+    'NDWI (Water Index)': lambda m: ('clear water conditions' if m > 0.3
+                                     else 'moderate water quality' if m > 0 else 'turbid or vegetated areas'),
+    'Turbidity': lambda m: 'low' if m < 0.5 else 'moderate' if m < 1.5 else 'high',
+}
+
+
+def _indicator_detail_html(indicator_name, values):
+    """Metric table, heading and interpretation of one indicator as a single markdown block"""
+    mean = values.get('mean', 0)
+    level_of = _INTERPRETATION_LEVEL.get(indicator_name)
+    interpretation = _INTERPRETATION_TMPL.get(indicator_name, "").format(
+        mean=format_number(mean),
+        level=level_of(mean) if level_of else ''
+    )
+    table = _STATS_TABLE_TMPL.format(
+        mean=format_number(mean),
+        p10=format_number(values.get('p10', 0)),
+        p50=format_number(values.get('p50', 0)),
+        p90=format_number(values.get('p90', 0)),
+        std=format_number(values.get('stdDev', 0)),
+        spread=format_number(values.get('p90', 0) - values.get('p10', 0))
+    )
+    return table + "\n\n### 💡 Interpretation\n" + interpretation
+
+# Documentation cards for each spectral index, rendered once at import
+_INDICATORS_DOC = [
+    {
+        'name': 'NDCI (Índice Normalizado de Clorofila)',
+        'formula': '(Red Edge - Red) / (Red Edge + Red)',
+        'bands': 'Banda 5 (705nm) y Banda 4 (665nm)',
+        'range': '-1 a +1',
+        'interpretation': 'Estima concentración de clorofila-a. Valores altos (>0.2) pueden indicar floraciones algales o condiciones eutróficas.'
+    },
+    {
+        'name': 'NDWI (Índice Normalizado de Agua)',
+        'formula': '(Green - NIR) / (Green + NIR)',
+        'bands': 'Banda 3 (560nm) y Banda 8 (842nm)',
+        'range': '-1 a +1',
+        'interpretation': 'Detecta cuerpos de agua. Valores >0.3 indican agua abierta, mientras que valores menores sugieren vegetación o tierra.'
+    },
+    {
+        'name': 'Índice de Turbidez',
+        'formula': 'Red / Blue',
+        'bands': 'Banda 4 (665nm) y Banda 2 (490nm)',
+        'range': '0 a ∞',
+        'interpretation': 'Aproxima concentración de sedimentos suspendidos. Valores altos (>1.5) indican agua turbia con alta carga de partículas.'
+    },
+    {
+        'name': 'CI-green (Índice de Clorofila Verde)',
+        'formula': '(NIR / Green) - 1',
+        'bands': 'Banda 8 (842nm) y Banda 3 (560nm)',
+        'range': '-1 a ∞',
+        'interpretation': 'Indicador alternativo de clorofila. Valores positivos sugieren presencia de vegetación acuática o algas.'
+    },
+    {
+        'name': 'TSM (Materia Suspendida Total)',
+        'formula': 'Modelo empírico complejo',
+        'bands': 'Múltiples bandas (Red, NIR)',
+        'range': '0 a 100+ mg/L',
+        'interpretation': 'Estima concentración total de partículas en suspensión. Útil para evaluar carga de sedimentos.'
+    },
+    {
+        'name': 'Concentración de Clorofila-a',
+        'formula': 'Derivada de correlación con NDCI',
+        'bands': 'Banda 5 y Banda 4',
+        'range': '0 a 100+ mg/m³',
+        'interpretation': 'Concentración aproximada de clorofila-a. Valores >10 mg/m³ pueden indicar condiciones eutróficas.'
+    }
+]
+
+_INDICATOR_DOC_TMPL = f"""
+<div class="info-card">
+    <h4 style="color: {COLORS['primary']}; margin-bottom: 0.5rem;">{{name}}</h4>
+    <p style="margin-bottom: 0.5rem;">
+        <strong>Formula:</strong> <code>{{formula}}</code><br>
+        <strong>Bands:</strong> {{bands}}<br>
+        <strong>Range:</strong> {{range}}
+    </p>
+    <p style="margin-bottom: 0; font-size: 0.9rem;">
+        <strong>Interpretation:</strong> {{interpretation}}
+    </p>
+</div>
+"""
+_INDICATORS_DOC_HTML = "".join(_INDICATOR_DOC_TMPL.format(**ind) for ind in _INDICATORS_DOC)
+
+# Status alerts split around their only variable parts
+MODO_RAPIDO_PRE = '<div class="alert alert-info"><strong>Modo Rápido:</strong> Procesando últimos '
+MODO_COMPLETO_PRE = '<div class="alert alert-warning"><strong>Modo Completo:</strong> Procesando últimos '
+MODO_POST = ' primera carga). Resultados en caché por 10 minutos.</div>'
+LAST_IMAGE_PRE = '<div class="alert alert-success"><strong>Última Imagen Procesada:</strong> '
+LAST_IMAGE_POST = ' | <strong>Procesamiento Completo</strong></div>'
+
+# Risk levels in risk_zones key order ('1', '2', '3') and their colors
+_RISK_LEVELS = ('Low', 'Medium', 'High')
+_RISK_COLORS = (COLORS['risk_low'], COLORS['risk_medium'], COLORS['risk_high'])
+
+# One indicator card of the water quality grid
+METRIC_CARD_TMPL = f"""
+<div class="metric-card" style="border-left-color: {{color}};">
+    <div class="metric-label">{{label}}</div>
+    <div class="metric-value" style="color: {{color}}; font-size: 1.5rem;">{{value}}</div>
+    <div class="metric-delta">
+        <span style="color: {COLORS['text']};">{{status}}</span>
+    </div>
+</div>
+"""
+
+# Indicator classes: (sorted thresholds, searchsorted side, labels, colors).
+# side='left' puts a value equal to a threshold in the lower class (x > t),
+# side='right' in the upper one (x >= t)
+NDCI_CLASSES = (np.array([-0.2, 0.2]), 'left', ('Low', 'Medium', 'High'),
+                (COLORS['chl_low'], COLORS['chl_medium'], COLORS['chl_high']))
+NDWI_CLASSES = (np.array([0.0, 0.3]), 'left', ('Turbid', 'Moderate', 'Clear'),
+                (COLORS['water_turbid'], COLORS['water_moderate'], COLORS['water_clean']))
+TURBIDITY_CLASSES = (np.array([0.5, 1.5]), 'right', ('Low', 'Medium', 'High'),
+                     (COLORS['success'], COLORS['warning'], COLORS['danger']))
+CHLA_CLASSES = (np.array([5.0, 10.0]), 'left', ('Low', 'Medium', 'High'),
+                (COLORS['chl_low'], COLORS['chl_medium'], COLORS['chl_high']))
+
+
+def _classify(classes, value):
+    """(label, color) of a scalar; an array gives per-element labels and colors"""
+    thresholds, side, labels, colors = classes
+    idx = np.searchsorted(thresholds, value, side=side)
+    if np.ndim(idx) == 0:
+        return labels[idx], colors[idx]
+    return np.take(labels, idx), np.take(colors, idx)
+
+
+# Distribution bars: the backend already reduces pixels to these statistics
+_DIST_LABELS = ('P10', 'P50 (Median)', 'P90', 'Mean')
+_DIST_KEYS = ('p10', 'p50', 'p90', 'mean')
+_DIST_COLORS = (COLORS['primary'], COLORS['secondary'], COLORS['accent'], COLORS['success'])
+
+
+def _distribution_values(stats, prefix):
+    """P10, P50, P90 and mean of one index from the flat statistics dict"""
+    return tuple(stats.get(f'{prefix}_{key}', 0) for key in _DIST_KEYS)
+
+
+# Layout and axis settings shared by every chart
+BASE_LAYOUT = dict(plot_bgcolor='white', paper_bgcolor='white', font=dict(family='Inter', color=COLORS['text']))
+BASE_AXIS = dict(gridcolor=COLORS['light'])
+
+@st.cache_resource(show_spinner=False)
+def _risk_donut_fig():
+    """Risk distribution donut template, built once and shared across sessions (never mutate it)"""
+    fig = go.Figure(data=[go.Pie(
+        labels=_RISK_LEVELS,
+        values=[0, 0, 0],
+        hole=0.4,
+        marker=dict(colors=_RISK_COLORS),
+        textinfo='label+percent',
+        textfont=dict(size=14, color='white', family='Inter'),
+        hovertemplate='<b>%{label}</b><br>Pixels: %{value:,}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    
+    fig.update_layout(
+        template="none",
+        showlegend=False,
+        height=300,
+        margin=dict(t=0, b=0, l=0, r=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _distribution_fig(title, y_title, values):
+    """P10/P50/P90/mean bar chart, built (and validated) once per set of values"""
+    fig = go.Figure(data=[
+        go.Bar(
+            x=_DIST_LABELS,
+            y=values,
+            marker_color=_DIST_COLORS,
+            text=[format_number(v) for v in values],
+            textposition='outside',
+            textfont=dict(size=12, family='Inter')
+        )
+    ])
+    
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=16, family='Inter', color=COLORS['dark'])),
+        xaxis_title='',
+        yaxis_title=y_title,
+        height=350,
+        margin=dict(t=50, b=50, l=50, r=50),
+        **BASE_LAYOUT
+    )
+    return fig
+
+# Summary bar/box charts need no hover or zoom: render them without plotly.js handlers
+_STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Radar indices and their 0-1 normalization: min(value * scale + offset, cap)
+_RADAR_KEYS = ('NDCI', 'NDWI', 'Turbidity', 'CI_green', 'TSM')
+_RADAR_CATEGORIES = ('NDCI', 'NDWI', 'Turbidity', 'CI-green', 'TSM')
+_RADAR_SCALE = np.array([0.5, 0.5, 0.5, 0.5, 0.01])[:, None]   # NDCI/NDWI/CI-green: -1..1, Turbidity: 0..2, TSM: 0..100
+_RADAR_OFFSET = np.array([0.5, 0.5, 0.0, 0.5, 0.0])[:, None]
+_RADAR_CAP = np.array([np.inf, np.inf, 1.0, np.inf, 1.0])[:, None]
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _radar_fig(categories, values_mean, values_p90):
+    """Mean vs P90 radar of the normalized indices, built once per set of values"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=values_mean,
+        theta=categories,
+        fill='toself',
+        name='Mean',
+        line=dict(color=COLORS['primary'], width=2),
+        fillcolor=RGBA['primary'].format(a=0.2)
+    ))
     
-    html += "</div>"
-    return html
+    fig.add_trace(go.Scatterpolar(
+        r=values_p90,
+        theta=categories,
+        fill='toself',
+        name='P90',
+        line=dict(color=COLORS['accent'], width=2),
+        fillcolor=RGBA['accent'].format(a=0.2)
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1],
+                gridcolor=COLORS['light']
+            ),
+            angularaxis=dict(gridcolor=COLORS['light'])
+        ),
+        showlegend=True,
+        height=400,
+        **BASE_LAYOUT
+    )
+    return fig
+
+# One row of the risk "Desglose por Nivel" breakdown
+_RISK_ROW_TMPL = f"""
+<div style="margin-bottom: 0.75rem;">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.25rem;">
+        <span style="font-weight: 600; color: {COLORS['text']};">{{level}}</span>
+        <span style="font-weight: 700; color: {{color}};">{{pct}}%</span>
+    </div>
+    <div style="background-color: {COLORS['light']}; height: 8px; border-radius: 4px; overflow: hidden;">
+        <div style="background-color: {{color}}; width: {{pct}}%; height: 100%;"></div>
+    </div>
+    <div style="font-size: 0.75rem; color: #7f8c8d; margin-top: 0.25rem;">{{pixels}} pixels</div>
+</div>
+"""
 
 # Main App
 def main():
     # Professional Header
-    st.markdown(f"""
-    <div class="header-container">
-        <h1 class="main-title">TITICACA SENTINEL</h1>
-        <p class="subtitle">Sistema de Monitoreo de Calidad del Agua | Lago Titicaca</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar Configuration
     with st.sidebar:
@@ -517,180 +1165,78 @@ def main():
             help="Valores más altos incluyen más imágenes pero pueden reducir la calidad"
         )
         
+        # Map measuring tool (off by default: extra plugin in every map)
+        measure_tool = st.toggle(
+            "Herramienta de medición",
+            value=False,
+            key="measure_tool",
+            help="Añade al mapa la herramienta para medir distancias y áreas"
+        )
+        
         # Processing info
         st.markdown("---")
         st.markdown("### Información de Procesamiento")
-        st.markdown(f"""
-        <div class="info-card">
-            <div style="font-size: 0.85rem;">
-                <strong>Período:</strong> {time_display}<br>
-                <strong>Filtro de Nubes:</strong> {cloud_coverage}%<br>
-                <strong>Tiempo Est.:</strong> ~{est_time}s<br>
-                <strong>Caché TTL:</strong> 10 minutes
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            SIDEBAR_INFO_PREFIX
+            + f"<strong>Período:</strong> {time_display}<br>"
+            f"<strong>Filtro de Nubes:</strong> {cloud_coverage}%<br>"
+            f"<strong>Tiempo Est.:</strong> ~{est_time}s<br>"
+            + SIDEBAR_INFO_SUFFIX,
+            unsafe_allow_html=True
+        )
         
         # Refresh button
         if st.button("Actualizar Datos", use_container_width=True):
             st.cache_data.clear()
+            # The prewarmed layers went with the cache: let them warm again
+            prewarm_prefixes = (_PREWARMED_PREFIX, _PREWARMING_PREFIX)
+            for key in [k for k in st.session_state if k.startswith(prewarm_prefixes)]:
+                del st.session_state[key]
             st.rerun()
         
         st.markdown("---")
         
         # Information
         st.markdown("### Acerca del Sistema")
-        st.markdown("""
-        <div class="info-card-content">
-            <strong>Fuente de Datos:</strong> Sentinel-2 SR<br>
-            <strong>Plataforma:</strong> Google Earth Engine<br>
-            <strong>Resolución:</strong> 10-20m<br>
-            <strong>Cobertura:</strong> Lago Titicaca<br>
-            <strong>Índices:</strong> NDWI, NDCI, Turbidez, Clorofila-a
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ABOUT_HTML, unsafe_allow_html=True)
     
     # Main content tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Evaluación de Riesgo",
-        "Calidad del Agua", 
-        "Análisis Temporal",
-        "Estadísticas",
-        "Documentación Técnica"
-    ])
+    # Only the selected section runs (st.tabs would execute every tab body)
+    active_tab = st.radio(
+        "Sección",
+        TAB_NAMES,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed"
+    )
     
     # TAB 1: RISK ASSESSMENT
-    with tab1:
+    if active_tab == TAB_NAMES[0]:
         st.markdown("## Mapa de Evaluación de Riesgo Ambiental")
         
         # Processing info alert
         if days:
-            st.markdown(f"""
-            <div class="alert alert-info">
-                <strong>Modo Rápido:</strong> Procesando últimos {days} días (~{est_time}s primera carga). Resultados en caché por 10 minutos.
-            </div>
-            """, unsafe_allow_html=True)
+            alert_html = MODO_RAPIDO_PRE + f"{days} días (~{est_time}s" + MODO_POST
         else:
-            st.markdown(f"""
-            <div class="alert alert-warning">
-                <strong>Modo Completo:</strong> Procesando últimos {months} meses (~{est_time}s primera carga). Resultados en caché por 10 minutos.
-            </div>
-            """, unsafe_allow_html=True)
+            alert_html = MODO_COMPLETO_PRE + f"{months} meses (~{est_time}s" + MODO_POST
+        st.markdown(alert_html, unsafe_allow_html=True)
         
         col1, col2 = st.columns([3, 1])
         
         with col1:
             # Load risk map data
             with st.spinner("Procesando imágenes Sentinel-2..."):
-                risk_data = api_client.get_risk_map(cloud_coverage=cloud_coverage, days=days, months=months)
+                risk_data = _risk_map(cloud_coverage, days, months)
             
             if risk_data:
-                # Date display
-                st.markdown(f"""
-                <div class="alert alert-success">
-                    <strong>Última Imagen Procesada:</strong> {risk_data['date']} | <strong>Procesamiento Completo</strong>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Layer selector
-                st.markdown("### 🎨 Layer Selection")
-                layer_type = st.selectbox(
-                    "Select visualization layer:",
-                    ["Mapa de Riesgo", "NDCI (Clorofila)", "NDWI (Agua)", "Turbidez"],
-                    key="layer_selector",
-                    label_visibility="collapsed"
-                )
-                
-                # Get additional data if needed for other layers
-                if layer_type != "Mapa de Riesgo":
-                    with st.spinner(f"Loading {layer_type}..."):
-                        latest_data = api_client.get_latest_data(cloud_coverage=cloud_coverage, days=days, months=months)
-                else:
-                    latest_data = None
+                # Switching layers should hit the caches instead of waiting on GEE + Folium
+                _start_layer_prewarm(cloud_coverage, days, months, measure_tool)
                 
-                # Create map
-                m = create_map()
-                
-                # Add ROI
-                roi_data = api_client.get_roi()
-                if roi_data:
-                    folium.GeoJson(
-                        roi_data,
-                        name='Lake Titicaca',
-                        style_function=lambda x: {
-                            'fillColor': 'transparent',
-                            'color': '#00A3E0',
-                            'weight': 3,
-                            'opacity': 0.8
-                        },
-                        tooltip='Lake Titicaca (7,286.56 km²)'
-                    ).add_to(m)
-                
-                # Add selected layer
-                if layer_type == "Mapa de Riesgo":
-                    risk_url = risk_data['tile_url']
-                    folium.TileLayer(
-                        tiles=risk_url,
-                        attr='Google Earth Engine',
-                        name='Environmental Risk',
-                        overlay=True,
-                        control=True,
-                        opacity=0.7
-                    ).add_to(m)
-                    
-                elif layer_type == "NDCI (Clorofila)" and latest_data:
-                    ndci_url = latest_data['tile_urls'].get('ndci', '')
-                    if ndci_url:
-                        folium.TileLayer(
-                            tiles=ndci_url,
-                            attr='Google Earth Engine',
-                            name='NDCI (Chlorophyll)',
-                            overlay=True,
-                            control=True,
-                            opacity=0.7
-                        ).add_to(m)
-                    else:
-                        st.warning("Capa NDCI no disponible para esta fecha")
-                        
-                elif layer_type == "NDWI (Agua)" and latest_data:
-                    ndwi_url = latest_data['tile_urls'].get('ndwi', '')
-                    if ndwi_url:
-                        folium.TileLayer(
-                            tiles=ndwi_url,
-                            attr='Google Earth Engine',
-                            name='NDWI (Water)',
-                            overlay=True,
-                            control=True,
-                            opacity=0.7
-                        ).add_to(m)
-                    else:
-                        st.warning("Capa NDWI no disponible para esta fecha")
-                        
-                elif layer_type == "Turbidez" and latest_data:
-                    turbidity_url = latest_data['tile_urls'].get('turbidity', '')
-                    if turbidity_url:
-                        folium.TileLayer(
-                            tiles=turbidity_url,
-                            attr='Google Earth Engine',
-                            name='Turbidity',
-                            overlay=True,
-                            control=True,
-                            opacity=0.7
-                        ).add_to(m)
-                    else:
-                        st.warning("Capa de Turbidez no disponible para esta fecha")
-                
-                # Add layer control
-                folium.LayerControl(position='topright').add_to(m)
-                
-                # Add scale
-                folium.plugins.MeasureControl(position='topleft', primary_length_unit='kilometers').add_to(m)
-                
-                # Display map
-                st_folium(m, width=None, height=600, key=f"map_{layer_type}")
+                # Date display
+                st.markdown(LAST_IMAGE_PRE + str(risk_data['date']) + LAST_IMAGE_POST, unsafe_allow_html=True)
                 
-                # Legend
-                st.markdown(create_legend_html(layer_type), unsafe_allow_html=True)
+                # Layer selector + map: changing the layer reruns only this fragment
+                _risk_map_fragment(risk_data, cloud_coverage, days, months, measure_tool)
         
         with col2:
             st.markdown("### Distribución de Riesgo")
@@ -698,41 +1244,21 @@ def main():
             if risk_data and 'risk_zones' in risk_data:
                 risk_zones = risk_data['risk_zones']
                 
-                # Convert to DataFrame
-                risk_df = pd.DataFrame([
-                    {'Level': 'Low', 'Pixels': int(risk_zones.get('1', 0)), 'Color': COLORS['risk_low']},
-                    {'Level': 'Medium', 'Pixels': int(risk_zones.get('2', 0)), 'Color': COLORS['risk_medium']},
-                    {'Level': 'High', 'Pixels': int(risk_zones.get('3', 0)), 'Color': COLORS['risk_high']}
-                ])
-                
-                # Calculate percentages
-                total_pixels = risk_df['Pixels'].sum()
+                # Pixel counts and percentages per level (Low, Medium, High)
+                pixels = np.array([int(risk_zones.get(k, 0)) for k in ('1', '2', '3')], dtype=np.int64)
+                total_pixels = pixels.sum()
                 if total_pixels > 0:
-                    risk_df['Percentage'] = (risk_df['Pixels'] / total_pixels * 100).round(1)
+                    percentages = np.round(pixels / total_pixels * 100, 1).tolist()
+                    pixels = pixels.tolist()
                     
-                    # Donut chart
-                    fig = go.Figure(data=[go.Pie(
-                        labels=risk_df['Level'],
-                        values=risk_df['Pixels'],
-                        hole=0.4,
-                        marker=dict(colors=risk_df['Color']),
-                        textinfo='label+percent',
-                        textfont=dict(size=14, color='white', family='Inter'),
-                        hovertemplate='<b>%{label}</b><br>Pixels: %{value:,}<br>Percentage: %{percent}<extra></extra>'
-                    )])
-                    
-                    fig.update_layout(
-                        showlegend=False,
-                        height=300,
-                        margin=dict(t=0, b=0, l=0, r=0),
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)'
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+                    # Donut chart (cached figure, only the values change)
+                    # Per-rerun copy: the cached template is shared by every session
+                    fig = go.Figure(_risk_donut_fig())
+                    fig.data[0].values = pixels
+                    st.plotly_chart(fig, use_container_width=True, key="risk_donut")
                     
                     # Key metrics
-                    high_risk_pct = risk_df[risk_df['Level']=='High']['Percentage'].values[0]
+                    high_risk_pct = percentages[2]
                     status, color = get_risk_interpretation(high_risk_pct)
                     
                     st.markdown(f"""
@@ -747,28 +1273,20 @@ def main():
                     
                     # Risk breakdown
                     st.markdown("### Desglose por Nivel")
-                    for _, row in risk_df.iterrows():
-                        st.markdown(f"""
-                        <div style="margin-bottom: 0.75rem;">
-                            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.25rem;">
-                                <span style="font-weight: 600; color: {COLORS['text']};">{row['Level']}</span>
-                                <span style="font-weight: 700; color: {row['Color']};">{row['Percentage']}%</span>
-                            </div>
-                            <div style="background-color: {COLORS['light']}; height: 8px; border-radius: 4px; overflow: hidden;">
-                                <div style="background-color: {row['Color']}; width: {row['Percentage']}%; height: 100%;"></div>
-                            </div>
-                            <div style="font-size: 0.75rem; color: #7f8c8d; margin-top: 0.25rem;">{row['Pixels']:,} pixels</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    breakdown_html = "".join(
+                        _RISK_ROW_TMPL.format(level=level, pct=pct, color=color, pixels=f"{count:,}")
+                        for level, pct, color, count in zip(_RISK_LEVELS, percentages, _RISK_COLORS, pixels)
+                    )
+                    st.markdown(breakdown_html, unsafe_allow_html=True)
             else:
                 st.info("No risk zone data available")
     
     # TAB 2: WATER QUALITY ANALYTICS
-    with tab2:
+    if active_tab == TAB_NAMES[1]:
         st.markdown("## Water Quality Indicators Analysis")
         
         with st.spinner("Loading water quality data..."):
-            latest_data = api_client.get_latest_data(cloud_coverage=cloud_coverage, days=days, months=months)
+            latest_data = _latest(cloud_coverage, days, months)
         
         if latest_data:
             stats = latest_data.get('statistics', {})
@@ -776,67 +1294,27 @@ def main():
             # Key indicators grid
             st.markdown("### 🔬 Key Indicators")
             
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                ndci_mean = stats.get('NDCI_mean', 0)
-                ndci_status = "High" if ndci_mean > 0.2 else "Medium" if ndci_mean > -0.2 else "Low"
-                ndci_color = COLORS['chl_high'] if ndci_mean > 0.2 else COLORS['chl_medium'] if ndci_mean > -0.2 else COLORS['chl_low']
-                
-                st.markdown(f"""
-                <div class="metric-card" style="border-left-color: {ndci_color};">
-                    <div class="metric-label">NDCI Mean</div>
-                    <div class="metric-value" style="color: {ndci_color}; font-size: 1.5rem;">{format_number(ndci_mean)}</div>
-                    <div class="metric-delta">
-                        <span style="color: {COLORS['text']};">Chlorophyll: {ndci_status}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                ndwi_mean = stats.get('NDWI_mean', 0)
-                ndwi_status = "Clear" if ndwi_mean > 0.3 else "Moderate" if ndwi_mean > 0 else "Turbid"
-                ndwi_color = COLORS['water_clean'] if ndwi_mean > 0.3 else COLORS['water_moderate'] if ndwi_mean > 0 else COLORS['water_turbid']
-                
-                st.markdown(f"""
-                <div class="metric-card" style="border-left-color: {ndwi_color};">
-                    <div class="metric-label">NDWI Mean</div>
-                    <div class="metric-value" style="color: {ndwi_color}; font-size: 1.5rem;">{format_number(ndwi_mean)}</div>
-                    <div class="metric-delta">
-                        <span style="color: {COLORS['text']};">Water: {ndwi_status}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                turb_mean = stats.get('Turbidity_mean', 0)
-                turb_status = "Low" if turb_mean < 0.5 else "Medium" if turb_mean < 1.5 else "High"
-                turb_color = COLORS['success'] if turb_mean < 0.5 else COLORS['warning'] if turb_mean < 1.5 else COLORS['danger']
-                
-                st.markdown(f"""
-                <div class="metric-card" style="border-left-color: {turb_color};">
-                    <div class="metric-label">Turbidity Mean</div>
-                    <div class="metric-value" style="color: {turb_color}; font-size: 1.5rem;">{format_number(turb_mean)}</div>
-                    <div class="metric-delta">
-                        <span style="color: {COLORS['text']};">Level: {turb_status}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            ndci_mean = stats.get('NDCI_mean', 0)
+            ndwi_mean = stats.get('NDWI_mean', 0)
+            turb_mean = stats.get('Turbidity_mean', 0)
+            chl_mean = stats.get('Chla_approx_mean', 0)
+            ndci_status, ndci_color = _classify(NDCI_CLASSES, ndci_mean)
+            ndwi_status, ndwi_color = _classify(NDWI_CLASSES, ndwi_mean)
+            turb_status, turb_color = _classify(TURBIDITY_CLASSES, turb_mean)
+            chl_status, chl_color = _classify(CHLA_CLASSES, chl_mean)
             
-            with col4:
-                chl_mean = stats.get('Chla_approx_mean', 0)
-                chl_status = "High" if chl_mean > 10 else "Medium" if chl_mean > 5 else "Low"
-                chl_color = COLORS['chl_high'] if chl_mean > 10 else COLORS['chl_medium'] if chl_mean > 5 else COLORS['chl_low']
-                
-                st.markdown(f"""
-                <div class="metric-card" style="border-left-color: {chl_color};">
-                    <div class="metric-label">Chlorophyll-a</div>
-                    <div class="metric-value" style="color: {chl_color}; font-size: 1.5rem;">{format_number(chl_mean)}</div>
-                    <div class="metric-delta">
-                        <span style="color: {COLORS['text']};">mg/m³ ({chl_status})</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            # All four cards in one element
+            cards = (
+                ('NDCI Mean', ndci_mean, ndci_color, f"Chlorophyll: {ndci_status}"),
+                ('NDWI Mean', ndwi_mean, ndwi_color, f"Water: {ndwi_status}"),
+                ('Turbidity Mean', turb_mean, turb_color, f"Level: {turb_status}"),
+                ('Chlorophyll-a', chl_mean, chl_color, f"mg/m³ ({chl_status})"),
+            )
+            cards_html = "<div class='metric-grid'>" + "".join(
+                METRIC_CARD_TMPL.format(label=label, value=format_number(value), color=color, status=status)
+                for label, value, color, status in cards
+            ) + "</div>"
+            st.markdown(cards_html, unsafe_allow_html=True)
             
             st.markdown("---")
             
@@ -847,133 +1325,30 @@ def main():
             
             with col1:
                 # NDCI distribution
-                ndci_data = {
-                    'Percentile': ['P10', 'P50 (Median)', 'P90', 'Mean'],
-                    'Value': [
-                        stats.get('NDCI_p10', 0),
-                        stats.get('NDCI_p50', 0),
-                        stats.get('NDCI_p90', 0),
-                        stats.get('NDCI_mean', 0)
-                    ]
-                }
-                
-                fig_ndci = go.Figure(data=[
-                    go.Bar(
-                        x=ndci_data['Percentile'],
-                        y=ndci_data['Value'],
-                        marker_color=[COLORS['primary'], COLORS['secondary'], COLORS['accent'], COLORS['success']],
-                        text=[format_number(v) for v in ndci_data['Value']],
-                        textposition='outside',
-                        textfont=dict(size=12, family='Inter')
-                    )
-                ])
-                
-                fig_ndci.update_layout(
-                    title=dict(text='NDCI Distribution', font=dict(size=16, family='Inter', color=COLORS['dark'])),
-                    xaxis_title='',
-                    yaxis_title='NDCI Value',
-                    height=350,
-                    margin=dict(t=50, b=50, l=50, r=50),
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(family='Inter', color=COLORS['text'])
-                )
+                ndci_values = _distribution_values(stats, 'NDCI')
                 
-                st.plotly_chart(fig_ndci, use_container_width=True)
+                fig_ndci = _distribution_fig('NDCI Distribution', 'NDCI Value', ndci_values)
+                st.plotly_chart(fig_ndci, use_container_width=True, config=_STATIC_PLOT_CONFIG)
             
             with col2:
                 # Turbidity distribution
-                turb_data = {
-                    'Percentile': ['P10', 'P50 (Median)', 'P90', 'Mean'],
-                    'Value': [
-                        stats.get('Turbidity_p10', 0),
-                        stats.get('Turbidity_p50', 0),
-                        stats.get('Turbidity_p90', 0),
-                        stats.get('Turbidity_mean', 0)
-                    ]
-                }
-                
-                fig_turb = go.Figure(data=[
-                    go.Bar(
-                        x=turb_data['Percentile'],
-                        y=turb_data['Value'],
-                        marker_color=[COLORS['primary'], COLORS['secondary'], COLORS['accent'], COLORS['success']],
-                        text=[format_number(v) for v in turb_data['Value']],
-                        textposition='outside',
-                        textfont=dict(size=12, family='Inter')
-                    )
-                ])
+                turb_values = _distribution_values(stats, 'Turbidity')
                 
-                fig_turb.update_layout(
-                    title=dict(text='Turbidity Distribution', font=dict(size=16, family='Inter', color=COLORS['dark'])),
-                    xaxis_title='',
-                    yaxis_title='Turbidity Value',
-                    height=350,
-                    margin=dict(t=50, b=50, l=50, r=50),
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(family='Inter', color=COLORS['text'])
-                )
-                
-                st.plotly_chart(fig_turb, use_container_width=True)
+                fig_turb = _distribution_fig('Turbidity Distribution', 'Turbidity Value', turb_values)
+                st.plotly_chart(fig_turb, use_container_width=True, config=_STATIC_PLOT_CONFIG)
             
             # Comparison radar chart
             st.markdown("### Comparación de Índices")
             
-            categories = ['NDCI', 'NDWI', 'Turbidity', 'CI-green', 'TSM']
-            
-            # Normalize values to 0-1 range for comparison
-            values_mean = [
-                (stats.get('NDCI_mean', 0) + 1) / 2,  # NDCI: -1 to 1 → 0 to 1
-                (stats.get('NDWI_mean', 0) + 1) / 2,  # NDWI: -1 to 1 → 0 to 1
-                min(stats.get('Turbidity_mean', 0) / 2, 1),  # Turbidity: 0 to 2 → 0 to 1
-                (stats.get('CI_green_mean', 0) + 1) / 2 if stats.get('CI_green_mean', 0) > -1 else 0,
-                min(stats.get('TSM_mean', 0) / 100, 1)  # TSM: 0 to 100 → 0 to 1
-            ]
-            
-            values_p90 = [
-                (stats.get('NDCI_p90', 0) + 1) / 2,
-                (stats.get('NDWI_p90', 0) + 1) / 2,
-                min(stats.get('Turbidity_p90', 0) / 2, 1),
-                (stats.get('CI_green_p90', 0) + 1) / 2 if stats.get('CI_green_p90', 0) > -1 else 0,
-                min(stats.get('TSM_p90', 0) / 100, 1)
-            ]
-            
-            fig_radar = go.Figure()
-            
-            fig_radar.add_trace(go.Scatterpolar(
-                r=values_mean,
-                theta=categories,
-                fill='toself',
-                name='Mean',
-                line=dict(color=COLORS['primary'], width=2),
-                fillcolor=f"rgba{tuple(list(int(COLORS['primary'][i:i+2], 16) for i in (1, 3, 5)) + [0.2])}"
-            ))
-            
-            fig_radar.add_trace(go.Scatterpolar(
-                r=values_p90,
-                theta=categories,
-                fill='toself',
-                name='P90',
-                line=dict(color=COLORS['accent'], width=2),
-                fillcolor=f"rgba(255, 107, 53, 0.2)"
-            ))
-            
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 1],
-                        gridcolor=COLORS['light']
-                    ),
-                    angularaxis=dict(gridcolor=COLORS['light'])
-                ),
-                showlegend=True,
-                height=400,
-                paper_bgcolor='white',
-                plot_bgcolor='white',
-                font=dict(family='Inter', color=COLORS['text'])
+            # Normalize mean (column 0) and P90 (column 1) of each index to 0-1 in one pass
+            raw = np.array(
+                [[stats.get(f'{key}_mean', 0), stats.get(f'{key}_p90', 0)] for key in _RADAR_KEYS],
+                dtype=np.float64
             )
+            norm = np.minimum(raw * _RADAR_SCALE + _RADAR_OFFSET, _RADAR_CAP)
+            norm[3] = np.where(raw[3] > -1, norm[3], 0)  # CI-green at or below -1 plots as 0
+            
+            fig_radar = _radar_fig(_RADAR_CATEGORIES, tuple(norm[:, 0].tolist()), tuple(norm[:, 1].tolist()))
             
             st.plotly_chart(fig_radar, use_container_width=True)
             
@@ -981,7 +1356,7 @@ def main():
             st.error("Failed to load water quality data")
     
     # TAB 3: TEMPORAL ANALYSIS
-    with tab3:
+    if active_tab == TAB_NAMES[2]:
         st.markdown("## Temporal Trend Analysis")
         
         st.markdown("""
@@ -1000,22 +1375,25 @@ def main():
         
         if st.button("Generar Análisis Temporal", use_container_width=True, type="primary"):
             with st.spinner("Generating temporal analysis..."):
-                ts_data = api_client.get_time_series(selected_lat, selected_lon, cloud_coverage=cloud_coverage, days=days, months=months)
+                ts_data = _time_series(selected_lat, selected_lon, cloud_coverage, days, months)
             
             if ts_data and ts_data.get('data'):
-                # Convert to DataFrame
-                df = pd.DataFrame([
-                    {
-                        'Date': pd.to_datetime(d['date']),
-                        'NDCI': d['ndci'],
-                        'Chlorophyll-a': d['chla_approx'],
-                        'Turbidity': d['turbidity'],
-                        'NDWI': d['ndwi']
+                # Convert to DataFrame column by column (one to_datetime call;
+                # float64 arrays turn missing values (None) into NaN), already
+                # in date order so the frame is never re-sorted
+                raw = ts_data['data']
+                dates = pd.to_datetime([d['date'] for d in raw])
+                order = np.argsort(dates.values, kind='stable')
+                df = pd.DataFrame({
+                    'Date': dates[order],
+                    **{
+                        column: np.array([d[key] for d in raw], dtype=np.float64)[order]
+                        for column, key in _TS_COLUMNS.items()
                     }
-                    for d in ts_data['data']
-                ])
+                })
                 
-                df = df.sort_values('Date')
+                # Summary statistics for the info cards, computed in one call
+                summary = df[['Chlorophyll-a', 'Turbidity']].agg(['mean', 'min', 'max', 'std'])
                 
                 # Multi-line time series
                 st.markdown("### Evolución de Indicadores")
@@ -1054,11 +1432,9 @@ def main():
                     hovermode='x unified',
                     height=450,
                     legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                    plot_bgcolor='white',
-                    paper_bgcolor='white',
-                    font=dict(family='Inter', color=COLORS['text']),
-                    xaxis=dict(gridcolor=COLORS['light']),
-                    yaxis=dict(gridcolor=COLORS['light'])
+                    **BASE_LAYOUT,
+                    xaxis=BASE_AXIS,
+                    yaxis=BASE_AXIS
                 )
                 
                 st.plotly_chart(fig_multi, use_container_width=True)
@@ -1078,7 +1454,7 @@ def main():
                         line=dict(color=COLORS['success'], width=3),
                         marker=dict(size=8, symbol='circle'),
                         fill='tonexty',
-                        fillcolor=f"rgba{tuple(list(int(COLORS['success'][i:i+2], 16) for i in (1, 3, 5)) + [0.2])}"
+                        fillcolor=RGBA['success'].format(a=0.2)
                     ))
                     
                     fig_chl.update_layout(
@@ -1086,11 +1462,9 @@ def main():
                         yaxis_title='Chlorophyll-a (mg/m³)',
                         hovermode='x',
                         height=350,
-                        plot_bgcolor='white',
-                        paper_bgcolor='white',
-                        font=dict(family='Inter', color=COLORS['text']),
-                        xaxis=dict(gridcolor=COLORS['light']),
-                        yaxis=dict(gridcolor=COLORS['light'])
+                        **BASE_LAYOUT,
+                        xaxis=BASE_AXIS,
+                        yaxis=BASE_AXIS
                     )
                     
                     st.plotly_chart(fig_chl, use_container_width=True)
@@ -1099,10 +1473,10 @@ def main():
                     st.markdown(f"""
                     <div class="info-card">
                         <strong>Statistics:</strong><br>
-                        Mean: {df['Chlorophyll-a'].mean():.2f} mg/m³<br>
-                        Min: {df['Chlorophyll-a'].min():.2f} mg/m³<br>
-                        Max: {df['Chlorophyll-a'].max():.2f} mg/m³<br>
-                        Std Dev: {df['Chlorophyll-a'].std():.2f} mg/m³
+                        Mean: {summary.at['mean', 'Chlorophyll-a']:.2f} mg/m³<br>
+                        Min: {summary.at['min', 'Chlorophyll-a']:.2f} mg/m³<br>
+                        Max: {summary.at['max', 'Chlorophyll-a']:.2f} mg/m³<br>
+                        Std Dev: {summary.at['std', 'Chlorophyll-a']:.2f} mg/m³
                     </div>
                     """, unsafe_allow_html=True)
                 
@@ -1118,7 +1492,7 @@ def main():
                         line=dict(color=COLORS['warning'], width=3),
                         marker=dict(size=8, symbol='diamond'),
                         fill='tonexty',
-                        fillcolor=f"rgba{tuple(list(int(COLORS['warning'][i:i+2], 16) for i in (1, 3, 5)) + [0.2])}"
+                        fillcolor=RGBA['warning'].format(a=0.2)
                     ))
                     
                     fig_turb.update_layout(
@@ -1126,11 +1500,9 @@ def main():
                         yaxis_title='Turbidity Index',
                         hovermode='x',
                         height=350,
-                        plot_bgcolor='white',
-                        paper_bgcolor='white',
-                        font=dict(family='Inter', color=COLORS['text']),
-                        xaxis=dict(gridcolor=COLORS['light']),
-                        yaxis=dict(gridcolor=COLORS['light'])
+                        **BASE_LAYOUT,
+                        xaxis=BASE_AXIS,
+                        yaxis=BASE_AXIS
                     )
                     
                     st.plotly_chart(fig_turb, use_container_width=True)
@@ -1139,29 +1511,25 @@ def main():
                     st.markdown(f"""
                     <div class="info-card">
                         <strong>Statistics:</strong><br>
-                        Mean: {df['Turbidity'].mean():.3f}<br>
-                        Min: {df['Turbidity'].min():.3f}<br>
-                        Max: {df['Turbidity'].max():.3f}<br>
-                        Std Dev: {df['Turbidity'].std():.3f}
+                        Mean: {summary.at['mean', 'Turbidity']:.3f}<br>
+                        Min: {summary.at['min', 'Turbidity']:.3f}<br>
+                        Max: {summary.at['max', 'Turbidity']:.3f}<br>
+                        Std Dev: {summary.at['std', 'Turbidity']:.3f}
                     </div>
                     """, unsafe_allow_html=True)
                 
                 # Data table
                 st.markdown("### Datos Procesados")
                 
-                # Format dataframe for display
-                display_df = df.copy()
-                display_df['Date'] = display_df['Date'].dt.strftime('%Y-%m-%d')
-                display_df = display_df.round(4)
-                
+                # Format for display only (Styler), no copy of the frame
                 st.dataframe(
-                    display_df,
+                    df.style.format(_TS_TABLE_FORMAT, na_rep=''),
                     use_container_width=True,
                     hide_index=True
                 )
                 
-                # Download button
-                csv = display_df.to_csv(index=False)
+                # Download button (CSV bytes cached per time series)
+                csv = _timeseries_csv(df)
                 st.download_button(
                     label="Descargar Datos (CSV)",
                     data=csv,
@@ -1173,32 +1541,30 @@ def main():
                 st.warning("No se encontraron datos para esta ubicación. Seleccione un punto dentro del Lago Titicaca.")
     
     # TAB 4: DETAILED STATISTICS
-    with tab4:
+    if active_tab == TAB_NAMES[3]:
         st.markdown("## Comprehensive Statistical Analysis")
         
         with st.spinner("Loading comprehensive statistics..."):
-            latest_data = api_client.get_latest_data(cloud_coverage=cloud_coverage, days=days, months=months)
+            latest_data = _latest(cloud_coverage, days, months)
         
         if latest_data:
             stats = latest_data.get('statistics', {})
             
-            # Organize statistics by indicator
-            indicators = {
-                'NDCI (Chlorophyll Index)': ['NDCI_mean', 'NDCI_p10', 'NDCI_p50', 'NDCI_p90', 'NDCI_stdDev'],
-                'NDWI (Water Index)': ['NDWI_mean', 'NDWI_p10', 'NDWI_p50', 'NDWI_p90', 'NDWI_stdDev'],
-                'Turbidity': ['Turbidity_mean', 'Turbidity_p10', 'Turbidity_p50', 'Turbidity_p90', 'Turbidity_stdDev'],
-                'CI-green': ['CI_green_mean', 'CI_green_p10', 'CI_green_p50', 'CI_green_p90', 'CI_green_stdDev'],
-                'TSM (Total Suspended Matter)': ['TSM_mean', 'TSM_p10', 'TSM_p50', 'TSM_p90', 'TSM_stdDev'],
-                'Chlorophyll-a (Approx.)': ['Chla_approx_mean', 'Chla_approx_p10', 'Chla_approx_p50', 'Chla_approx_p90', 'Chla_approx_stdDev']
-            }
+            # Every indicator's statistics in one table: rows = statistic, columns = indicator
+            stats_df = pd.DataFrame(
+                {
+                    name: [stats.get(f'{prefix}_{key}', 0) for key in _STAT_KEYS]
+                    for name, prefix in INDICATOR_PREFIXES.items()
+                },
+                index=list(_STAT_KEYS)
+            )
             
             # Create tabs for each indicator
-            indicator_tabs = st.tabs(list(indicators.keys()))
+            indicator_tabs = st.tabs(list(INDICATOR_PREFIXES))
             
-            for idx, (indicator_name, indicator_keys) in enumerate(indicators.items()):
+            for idx, indicator_name in enumerate(INDICATOR_PREFIXES):
                 with indicator_tabs[idx]:
-                    # Extract values
-                    values = {key.split('_')[-1]: stats.get(key, 0) for key in indicator_keys}
+                    values = stats_df[indicator_name]
                     
                     col1, col2 = st.columns([1, 1])
                     
@@ -1223,123 +1589,32 @@ def main():
                             yaxis_title='Value',
                             height=350,
                             showlegend=False,
-                            plot_bgcolor='white',
-                            paper_bgcolor='white',
-                            font=dict(family='Inter', color=COLORS['text'])
+                            **BASE_LAYOUT
                         )
                         
-                        st.plotly_chart(fig_box, use_container_width=True)
+                        st.plotly_chart(fig_box, use_container_width=True, config=_STATIC_PLOT_CONFIG)
                     
                     with col2:
-                        # Statistics table
+                        # Statistics table, heading and interpretation in one element
                         st.markdown("### 📊 Statistical Metrics")
-                        
-                        st.markdown(f"""
-                        <table class="stats-table">
-                            <thead>
-                                <tr>
-                                    <th>Metric</th>
-                                    <th>Value</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                <tr>
-                                    <td><strong>Mean (Average)</strong></td>
-                                    <td>{format_number(values.get('mean', 0))}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>10th Percentile</strong></td>
-                                    <td>{format_number(values.get('p10', 0))}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Median (50th Percentile)</strong></td>
-                                    <td>{format_number(values.get('p50', 0))}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>90th Percentile</strong></td>
-                                    <td>{format_number(values.get('p90', 0))}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Standard Deviation</strong></td>
-                                    <td>{format_number(values.get('stdDev', 0))}</td>
-                                </tr>
-                                <tr>
-                                    <td><strong>Range (P10-P90)</strong></td>
-                                    <td>{format_number(values.get('p90', 0) - values.get('p10', 0))}</td>
-                                </tr>
-                            </tbody>
-                        </table>
-                        """, unsafe_allow_html=True)
-                        
-                        # Interpretation
-                        st.markdown("### 💡 Interpretation")
-                        
-                        interpretations = {
-                            'NDCI (Chlorophyll Index)': f"""
-                                <div class="info-card">
-                                    The mean NDCI value of <strong>{format_number(values.get('mean', 0))}</strong> indicates 
-                                    {'high' if values.get('mean', 0) > 0.2 else 'moderate' if values.get('mean', 0) > -0.2 else 'low'} 
-                                    chlorophyll concentration. Values closer to 1 indicate higher chlorophyll presence, 
-                                    which may suggest eutrophication or algal blooms.
-                                </div>
-                            """,
-                            'NDWI (Water Index)': f"""
-                                <div class="info-card">
-                                    The mean NDWI value of <strong>{format_number(values.get('mean', 0))}</strong> suggests 
-                                    {'clear water conditions' if values.get('mean', 0) > 0.3 else 'moderate water quality' if values.get('mean', 0) > 0 else 'turbid or vegetated areas'}. 
-                                    Higher NDWI values (>0.3) typically indicate clear, deep water.
-                                </div>
-                            """,
-                            'Turbidity': f"""
-                                <div class="info-card">
-                                    Average turbidity of <strong>{format_number(values.get('mean', 0))}</strong> indicates 
-                                    {'low' if values.get('mean', 0) < 0.5 else 'moderate' if values.get('mean', 0) < 1.5 else 'high'} 
-                                    sediment concentration. Lower values suggest clearer water with less suspended particles.
-                                </div>
-                            """,
-                            'CI-green': f"""
-                                <div class="info-card">
-                                    The CI-green index value of <strong>{format_number(values.get('mean', 0))}</strong> 
-                                    helps detect aquatic vegetation. Positive values may indicate presence of algae or aquatic plants.
-                                </div>
-                            """,
-                            'TSM (Total Suspended Matter)': f"""
-                                <div class="info-card">
-                                    TSM mean value of <strong>{format_number(values.get('mean', 0))}</strong> represents 
-                                    the concentration of suspended particles. Higher values may indicate erosion, pollution, 
-                                    or resuspension of sediments.
-                                </div>
-                            """,
-                            'Chlorophyll-a (Approx.)': f"""
-                                <div class="info-card">
-                                    Estimated chlorophyll-a concentration of <strong>{format_number(values.get('mean', 0))} mg/m³</strong> 
-                                    provides an approximation of algal biomass. Values >10 mg/m³ may indicate eutrophic conditions.
-                                </div>
-                            """
-                        }
-                        
-                        st.markdown(interpretations.get(indicator_name, ""), unsafe_allow_html=True)
+                        st.markdown(_indicator_detail_html(indicator_name, values), unsafe_allow_html=True)
             
             # Summary comparison
             st.markdown("---")
             st.markdown("## 📈 Cross-Indicator Summary")
             
-            # Create summary dataframe
-            summary_data = []
-            for indicator_name, indicator_keys in indicators.items():
-                mean_key = [k for k in indicator_keys if 'mean' in k][0]
-                std_key = [k for k in indicator_keys if 'stdDev' in k][0]
-                p50_key = [k for k in indicator_keys if 'p50' in k][0]
-                
-                summary_data.append({
-                    'Indicator': indicator_name.split(' (')[0],
-                    'Mean': format_number(stats.get(mean_key, 0)),
-                    'Median': format_number(stats.get(p50_key, 0)),
-                    'Std Dev': format_number(stats.get(std_key, 0)),
-                    'CV (%)': format_number(abs(stats.get(std_key, 0) / stats.get(mean_key, 1) * 100) if stats.get(mean_key, 0) != 0 else 0, 1)
-                })
+            # Create summary dataframe (CV is 0 where the mean is 0)
+            table = stats_df.T
+            mean, std = table['mean'].to_numpy(), table['stdDev'].to_numpy()
+            cv = np.abs(np.divide(std, mean, out=np.zeros_like(mean, dtype=np.float64), where=mean != 0)) * 100
             
-            summary_df = pd.DataFrame(summary_data)
+            summary_df = pd.DataFrame({
+                'Indicator': [name.split(' (')[0] for name in table.index],
+                'Mean': [format_number(v) for v in mean],
+                'Median': [format_number(v) for v in table['p50']],
+                'Std Dev': [format_number(v) for v in std],
+                'CV (%)': [format_number(v, 1) for v in cv],
+            })
             
             st.dataframe(
                 summary_df,
@@ -1358,7 +1633,7 @@ def main():
             st.error("Failed to load statistics data")
     
     # TAB 5: DOCUMENTATION
-    with tab5:
+    if active_tab == TAB_NAMES[4]:
         st.markdown("## Documentación del Proyecto")
         
         # Project overview
@@ -1409,66 +1684,8 @@ def main():
             ### Índices Espectrales Calculados
             """)
             
-            # Indicators details
-            indicators_doc = [
-                {
-                    'name': 'NDCI (Índice Normalizado de Clorofila)',
-                    'formula': '(Red Edge - Red) / (Red Edge + Red)',
-                    'bands': 'Banda 5 (705nm) y Banda 4 (665nm)',
-                    'range': '-1 a +1',
-                    'interpretation': 'Estima concentración de clorofila-a. Valores altos (>0.2) pueden indicar floraciones algales o condiciones eutróficas.'
-                },
-                {
-                    'name': 'NDWI (Índice Normalizado de Agua)',
-                    'formula': '(Green - NIR) / (Green + NIR)',
-                    'bands': 'Banda 3 (560nm) y Banda 8 (842nm)',
-                    'range': '-1 a +1',
-                    'interpretation': 'Detecta cuerpos de agua. Valores >0.3 indican agua abierta, mientras que valores menores sugieren vegetación o tierra.'
-                },
-                {
-                    'name': 'Índice de Turbidez',
-                    'formula': 'Red / Blue',
-                    'bands': 'Banda 4 (665nm) y Banda 2 (490nm)',
-                    'range': '0 a ∞',
-                    'interpretation': 'Aproxima concentración de sedimentos suspendidos. Valores altos (>1.5) indican agua turbia con alta carga de partículas.'
-                },
-                {
-                    'name': 'CI-green (Índice de Clorofila Verde)',
-                    'formula': '(NIR / Green) - 1',
-                    'bands': 'Banda 8 (842nm) y Banda 3 (560nm)',
-                    'range': '-1 a ∞',
-                    'interpretation': 'Indicador alternativo de clorofila. Valores positivos sugieren presencia de vegetación acuática o algas.'
-                },
-                {
-                    'name': 'TSM (Materia Suspendida Total)',
-                    'formula': 'Modelo empírico complejo',
-                    'bands': 'Múltiples bandas (Red, NIR)',
-                    'range': '0 a 100+ mg/L',
-                    'interpretation': 'Estima concentración total de partículas en suspensión. Útil para evaluar carga de sedimentos.'
-                },
-                {
-                    'name': 'Concentración de Clorofila-a',
-                    'formula': 'Derivada de correlación con NDCI',
-                    'bands': 'Banda 5 y Banda 4',
-                    'range': '0 a 100+ mg/m³',
-                    'interpretation': 'Concentración aproximada de clorofila-a. Valores >10 mg/m³ pueden indicar condiciones eutróficas.'
-                }
-            ]
-            
-            for ind in indicators_doc:
-                st.markdown(f"""
-                <div class="info-card">
-                    <h4 style="color: {COLORS['primary']}; margin-bottom: 0.5rem;">{ind['name']}</h4>
-                    <p style="margin-bottom: 0.5rem;">
-                        <strong>Formula:</strong> <code>{ind['formula']}</code><br>
-                        <strong>Bands:</strong> {ind['bands']}<br>
-                        <strong>Range:</strong> {ind['range']}
-                    </p>
-                    <p style="margin-bottom: 0; font-size: 0.9rem;">
-                        <strong>Interpretation:</strong> {ind['interpretation']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Indicators details (static, rendered as one block)
+            st.markdown(_INDICATORS_DOC_HTML, unsafe_allow_html=True)
         
         with col2:
             # Quick facts
@@ -44,52 +44,50 @@ def create_map(center=MAP_CENTER, zoom=MAP_DEFAULT_ZOOM):
     return m
 
 
-def create_legend_html(layer_type):
-    """Create custom legend HTML"""
-    legends = {
-        "Mapa de Riesgo": {
-            "title": "Nivel de Riesgo Ambiental",
-            "items": [
-                (COLORS['risk_low'], "Condiciones Normales", "Indicadores bajo percentil 70"),
-                (COLORS['risk_medium'], "Atención Requerida", "Indicadores entre percentil 70-90"),
-                (COLORS['risk_high'], "Zona Crítica", "Indicadores sobre percentil 90"),
-            ]
-        },
-        "NDCI (Clorofila)": {
-            "title": "Índice de Clorofila Normalizado",
-            "items": [
-                ("#3498DB", "Baja Concentración", "NDCI < -0.2 | Aguas oligotróficas"),
-                ("#2ECC71", "Concentración Moderada", "-0.2 ≤ NDCI ≤ 0.2 | Aguas mesotróficas"),
-                ("#E74C3C", "Alta Concentración", "NDCI > 0.2 | Posible eutrofización"),
-            ]
-        },
-        "NDWI (Agua)": {
-            "title": "Índice Normalizado de Agua",
-            "items": [
-                ("#E74C3C", "Tierra/Vegetación", "NDWI < 0 | Áreas terrestres"),
-                ("#F39C12", "Agua Turbia", "0 ≤ NDWI ≤ 0.3 | Sedimentos suspendidos"),
-                ("#3498DB", "Agua Clara", "NDWI > 0.3 | Cuerpo de agua definido"),
-            ]
-        },
-        "Turbidez": {
-            "title": "Nivel de Turbidez Relativa",
-            "items": [
-                ("#3498DB", "Baja Turbidez", "Ratio < 0.5 | Buena claridad"),
-                ("#F39C12", "Turbidez Moderada", "0.5 ≤ Ratio ≤ 1.5 | Sedimentos moderados"),
-                ("#8B4513", "Alta Turbidez", "Ratio > 1.5 | Alta carga de sedimentos"),
-            ]
-        }
+# Legend definitions per layer: title and (color, label, description) items
+_LEGENDS = {
+    "Mapa de Riesgo": {
+        "title": "Nivel de Riesgo Ambiental",
+        "items": [
+            (COLORS['risk_low'], "Condiciones Normales", "Indicadores bajo percentil 70"),
+            (COLORS['risk_medium'], "Atención Requerida", "Indicadores entre percentil 70-90"),
+            (COLORS['risk_high'], "Zona Crítica", "Indicadores sobre percentil 90"),
+        ]
+    },
+    "NDCI (Clorofila)": {
+        "title": "Índice de Clorofila Normalizado",
+        "items": [
+            ("#3498DB", "Baja Concentración", "NDCI < -0.2 | Aguas oligotróficas"),
+            ("#2ECC71", "Concentración Moderada", "-0.2 ≤ NDCI ≤ 0.2 | Aguas mesotróficas"),
+            ("#E74C3C", "Alta Concentración", "NDCI > 0.2 | Posible eutrofización"),
+        ]
+    },
+    "NDWI (Agua)": {
+        "title": "Índice Normalizado de Agua",
+        "items": [
+            ("#E74C3C", "Tierra/Vegetación", "NDWI < 0 | Áreas terrestres"),
+            ("#F39C12", "Agua Turbia", "0 ≤ NDWI ≤ 0.3 | Sedimentos suspendidos"),
+            ("#3498DB", "Agua Clara", "NDWI > 0.3 | Cuerpo de agua definido"),
+        ]
+    },
+    "Turbidez": {
+        "title": "Nivel de Turbidez Relativa",
+        "items": [
+            ("#3498DB", "Baja Turbidez", "Ratio < 0.5 | Buena claridad"),
+            ("#F39C12", "Turbidez Moderada", "0.5 ≤ Ratio ≤ 1.5 | Sedimentos moderados"),
+            ("#8B4513", "Alta Turbidez", "Ratio > 1.5 | Alta carga de sedimentos"),
+        ]
     }
-    
-    legend = legends.get(layer_type, legends["Mapa de Riesgo"])
-    
-    html = f"""
+}
+
+
+def _build_legend_html(legend):
+    """Assemble one legend's HTML with a single join"""
+    parts = [f"""
     <div class="legend-container">
         <div class="legend-title">{legend['title']}</div>
-    """
-    
-    for color, label, description in legend['items']:
-        html += f"""
+    """]
+    parts.extend(f"""
         <div class="legend-item">
             <div class="legend-color" style="background-color: {color};"></div>
             <div>
@@ -97,10 +95,18 @@ def create_legend_html(layer_type):
                 <div style="font-size: 0.75rem; color: #7f8c8d;">{description}</div>
             </div>
         </div>
-        """
-    
-    html += "</div>"
-    return html
+        """ for color, label, description in legend['items'])
+    parts.append("</div>")
+    return "".join(parts)
+
+
+# Finished legend HTML, built once at import time
+LEGEND_HTML = {name: _build_legend_html(legend) for name, legend in _LEGENDS.items()}
+
+
+def create_legend_html(layer_type):
+    """Create custom legend HTML"""
+    return LEGEND_HTML.get(layer_type, LEGEND_HTML["Mapa de Riesgo"])
 
 
 def add_tile_overlay(m: folium.Map, tile_url: str, name: str = 'Overlay', opacity: float = 0.8):
@@ -18,17 +18,18 @@ def render_risk_tab(api_client, latest_data):
     st.markdown("### 🎯 Evaluación de Riesgo Ambiental")
     st.markdown("**Análisis integrado de indicadores de calidad del agua basado en datos satelitales Sentinel-2**")
     
-    # Load risk map data
-    risk_data = None
-    try:
-        with st.spinner("Cargando mapa de riesgo... (2-3 minutos, procesamiento en Earth Engine)"):
-            risk_data = api_client.get_risk_map(
-                cloud_coverage=DEFAULT_CLOUD_COVERAGE,
-                days=DEFAULT_DAYS
-            )
-    except Exception as e:
-        render_alert(f"❌ Error al cargar mapa de riesgo: {str(e)}", "danger")
-        return
+    # Risk map is prefetched with the latest data; fetch it only if missing
+    risk_data = latest_data.get('risk_map') if latest_data else None
+    if not risk_data:
+        try:
+            with st.spinner("Cargando mapa de riesgo... (2-3 minutos, procesamiento en Earth Engine)"):
+                risk_data = api_client.get_risk_map(
+                    cloud_coverage=DEFAULT_CLOUD_COVERAGE,
+                    days=DEFAULT_DAYS
+                )
+        except Exception as e:
+            render_alert(f"❌ Error al cargar mapa de riesgo: {str(e)}", "danger")
+            return
     
     if not risk_data or 'risk_zones' not in risk_data:
         render_alert("⚠️ No se pudo cargar el mapa de riesgo. Intente recargar la página.", "warning")
@@ -2,7 +2,7 @@
 Frontend utilities package
 """
 from frontend.utils.config import COLORS, API_BASE_URL, LAKE_BOUNDS
-from frontend.utils.api_client import api_client
+from frontend.utils.api_client import api_client, get_api_client
 from frontend.utils.helpers import (
     format_number,
     get_risk_interpretation,
@@ -14,6 +14,7 @@ __all__ = [
     'API_BASE_URL',
     'LAKE_BOUNDS',
     'api_client',
+    'get_api_client',
     'format_number',
     'get_risk_interpretation',
     'validate_coordinates'
@@ -2,6 +2,7 @@
 API client for backend communication
 Centralized API calls with error handling
 """
+import orjson
 import requests
 import streamlit as st
 from typing import Dict, Optional, Any
@@ -15,7 +16,7 @@ class APIClient:
         self.base_url = base_url
         self.timeout = API_TIMEOUT
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+    def _make_request(self, endpoint: str, params: Dict = None, use_cache: bool = True) -> Optional[Dict]:
         """Make HTTP GET request with error handling"""
         # Build deterministic cache key from endpoint and params
         cache_key = (endpoint, tuple(sorted(params.items())) if params else None)
@@ -31,7 +32,7 @@ class APIClient:
             cache = self._local_cache
 
         # Return cached response if available
-        if cache_key in cache:
+        if use_cache and cache_key in cache:
             print(f"[DEBUG] API cache hit for {cache_key}")
             return cache[cache_key]
 
@@ -51,10 +52,13 @@ class APIClient:
 
             response.raise_for_status()
 
-            data = response.json()
+            # orjson parses the raw bytes directly (requests' .json() decodes to str first)
+            data = orjson.loads(response.content)
             print(f"[DEBUG] Response data keys: {list(data.keys()) if isinstance(data, dict) else 'None'}")  # DEBUG
 
             # Store in cache for this Streamlit session
+            if not use_cache:
+                return data
             try:
                 st.session_state.setdefault("_api_cache", {})[cache_key] = data
             except Exception:
@@ -97,6 +101,16 @@ class APIClient:
         
         return _self._make_request("/risk-map", params)
     
+    def get_dashboard(_self, cloud_coverage: int = 20, days: int = None, months: int = None) -> Optional[Dict]:
+        """Fetch latest data and risk map for one period in a single request"""
+        params = {'cloud_coverage': cloud_coverage}
+        if days is not None:
+            params['days'] = days
+        elif months is not None:
+            params['months'] = months
+        
+        return _self._make_request("/dashboard", params)
+    
     # TEMPORARILY DISABLED CACHE FOR DEBUGGING
     # @st.cache_data(ttl=600, show_spinner=False)
     def get_time_series(
@@ -160,8 +174,8 @@ class APIClient:
         return _self._make_request("/predict", params)
     
     def health_check(_self) -> Optional[Dict]:
-        """Check API health status"""
-        return _self._make_request("/health")
+        """Check API health status (never served from the session cache)"""
+        return _self._make_request("/health", use_cache=False)
 
     def clear_cache(_self) -> None:
         """Clear the session/local API cache used to avoid repeated requests.
@@ -179,5 +193,11 @@ class APIClient:
                 print("[DEBUG] Cleared local API cache")
 
 
+@st.cache_resource(show_spinner=False)
+def get_api_client() -> APIClient:
+    """API client shared by every session and rerun"""
+    return APIClient()
+
+
 # Global API client instance
 api_client = APIClient()
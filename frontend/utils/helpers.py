@@ -1,6 +1,7 @@
 """
 Utility functions for data formatting and validation
 """
+import functools
 from typing import Tuple, Dict, Any
 
 
@@ -62,6 +63,12 @@ def transform_statistics(backend_stats: Dict[str, float]) -> Dict[str, Dict[str,
 
 def format_number(value: float, decimals: int = 2) -> str:
     """Format number with appropriate precision"""
+    # Coerce numpy scalars so equal values share one cache entry
+    return _format_number(float(value), decimals)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_number(value: float, decimals: int) -> str:
     if abs(value) < 0.01:
         return f"{value:.4f}"
     elif abs(value) < 1:
@@ -222,6 +222,75 @@ class TiticacaProcessor:
         
         return stats.getInfo()
     
+    def get_time_series_means(self, offsets, days=7, cloud_coverage=20, bands=None):
+        """Lake-wide mean index values for several periods in one request
+        
+        Each offset describes a window of `days` days ending `offset` days ago
+        (same as process_latest). All windows are reduced server-side and
+        fetched with a single getInfo() call.
+        
+        Returns:
+            Dict mapping offset -> {'date': latest image date,
+            'statistics': {'<band>_mean': value}}; offsets without images are omitted
+        """
+        bands = bands or ['NDWI', 'NDCI', 'CI_green', 'Turbidity', 'TSM', 'Chla_approx']
+        roi = self.get_lake_roi()
+        now = datetime.now()
+        
+        windows = []
+        for offset in offsets:
+            end_date = now - timedelta(days=offset)
+            start_date = end_date - timedelta(days=days)
+            windows.append({
+                'offset': offset,
+                'start': start_date.strftime('%Y-%m-%d'),
+                'end': end_date.strftime('%Y-%m-%d')
+            })
+        
+        s2 = (ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
+              .filterBounds(roi)
+              .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', cloud_coverage)))
+        
+        def reduce_window(window):
+            window = ee.Dictionary(window)
+            period = (s2.filterDate(window.get('start'), window.get('end'))
+                      .map(self.mask_s2_clouds)
+                      .map(self.calculate_indices))
+            
+            # Same reduction as get_statistics' mean, on the period's median composite
+            means = period.select(bands).median().reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=roi,
+                scale=100,
+                maxPixels=1e9
+            )
+            
+            return ee.Feature(None, means).set({
+                'offset': window.get('offset'),
+                'count': period.size(),
+                'latest_time': period.aggregate_max('system:time_start')
+            })
+        
+        features = ee.FeatureCollection(ee.List(windows).map(reduce_window)).getInfo()
+        
+        results = {}
+        for feature in features.get('features', []):
+            props = feature.get('properties', {})
+            if not props.get('count'):
+                continue
+            
+            latest = datetime.utcfromtimestamp(props['latest_time'] / 1000)
+            results[int(props['offset'])] = {
+                'date': latest.strftime('%Y-%m-%d'),
+                'statistics': {
+                    f'{band}_mean': props[band]
+                    for band in bands
+                    if props.get(band) is not None
+                }
+            }
+        
+        return results
+    
     def get_time_series(self, lat, lon, months=6, cloud_coverage=20):
         """Get time series data for a specific point"""
         end_date = datetime.now()